@@ -2,50 +2,64 @@
 
 from __future__ import annotations
 
-import json
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pathlib import Path
 
-from chatbot_parking.guardrails import contains_sensitive_data, redact_sensitive
-from chatbot_parking.guardrails import contains_prompt_injection
+import orjson
+
+from chatbot_parking.guardrails import DocumentScan, redact_sensitive_with_count, scan_documents
 from chatbot_parking.rag import build_vector_store
 from chatbot_parking.static_docs import load_static_documents
 
 OUTPUT_PATH = Path("data/ingest_report.json")
+SCAN_CHUNK_SIZE = 64
+
 
+def _scan_all(texts: list[str], workers: int) -> list[DocumentScan]:
+    # Process startup dominates for small corpora; only fan out when there is real work.
+    if workers <= 1 or len(texts) <= SCAN_CHUNK_SIZE:
+        return scan_documents(texts)
+    chunks = [texts[start : start + SCAN_CHUNK_SIZE] for start in range(0, len(texts), SCAN_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [scan for chunk_scans in pool.map(scan_documents, chunks) for scan in chunk_scans]
 
-def ingest() -> dict:
+
+def ingest(workers: int | None = None) -> dict:
     documents = load_static_documents()
+    if workers is None:
+        workers = int(os.getenv("INGEST_WORKERS", "1"))
     redacted_count = 0
     injection_count = 0
     injection_ids: list[str] = []
-    processed = []
+    ids: list[str] = []
+    redacted_texts: list[str] = []
+    sensitivity: list[str] = []
 
-    for doc in documents:
-        redacted_text = redact_sensitive(doc["text"])
-        if redacted_text != doc["text"]:
+    scans = _scan_all([doc["text"] for doc in documents], workers)
+    for doc, scan in zip(documents, scans):
+        redacted_text, redactions = redact_sensitive_with_count(doc["text"]) if scan.sensitive else (doc["text"], 0)
+        if redactions:
             redacted_count += 1
-        if contains_prompt_injection(doc["text"]):
+        ids.append(doc["id"])
+        redacted_texts.append(redacted_text)
+        sensitivity.append("private" if scan.sensitive else "public")
+        if scan.prompt_injection:
             injection_count += 1
             injection_ids.append(str(doc.get("id") or "unknown"))
-        processed.append(
-            {
-                "id": doc["id"],
-                "sensitivity": "private" if contains_sensitive_data(doc["text"]) else "public",
-                "text": redacted_text,
-            }
-        )
-
-    build_vector_store()
+
+    # Reuse the guardrail pass above instead of letting the store redo it.
+    build_vector_store(ids=ids, texts=redacted_texts, sensitivity=sensitivity)
     report = {
-        "total_documents": len(processed),
+        "total_documents": len(documents),
         "redacted_documents": redacted_count,
         "prompt_injection_documents": injection_count,
         "prompt_injection_ids": injection_ids[:20],
         "output_path": str(OUTPUT_PATH),
     }
-    OUTPUT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    OUTPUT_PATH.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
     return report
 
 
 if __name__ == "__main__":
-    print(json.dumps(ingest(), indent=2))
+    print(orjson.dumps(ingest(), option=orjson.OPT_INDENT_2).decode())
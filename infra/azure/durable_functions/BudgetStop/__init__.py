@@ -5,15 +5,34 @@ Intended to be called from an Azure Cost Management Budget via an Action Group w
 
 from __future__ import annotations
 
-import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
 
 import azure.functions as func
 from azure.identity import DefaultAzureCredential
-import requests
+import httpx
+import orjson
 
 ARM_SCOPE = "https://management.azure.com/.default"
+MAX_PARALLEL_STOPS = 16
+# Refresh the cached ARM token this many seconds before it expires.
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Optional target settings are read once per worker; app settings changes restart it.
+CONTAINER_APPS = tuple(
+    name.strip() for name in os.environ.get("AUTO_STOP_CONTAINER_APP_NAMES", "").split(",") if name.strip()
+)
+FUNCTION_APP_NAME = os.environ.get("AUTO_STOP_FUNCTION_APP_NAME", "").strip()
+STOP_FUNCTION_APP = os.environ.get("AUTO_STOP_STOP_FUNCTION_APP", "false").strip().lower() in {"1", "true", "yes"}
+CONTAINERAPPS_API_VERSION = os.environ.get("AUTO_STOP_CONTAINERAPPS_API_VERSION", "2024-03-01").strip()
+WEB_API_VERSION = os.environ.get("AUTO_STOP_WEB_API_VERSION", "2024-04-01").strip()
+
+_TOKEN_LOCK = threading.Lock()
+_TOKEN_CACHE: dict[str, Any] = {"token": None, "expires_on": 0}
 
 
 def _env(name: str) -> str:
@@ -23,25 +42,50 @@ def _env(name: str) -> str:
     return value
 
 
-def _arm_post(url: str, *, token: str) -> dict[str, Any]:
+@lru_cache(maxsize=1)
+def _get_client() -> httpx.Client:
+    # Shared across invocations so warm workers skip the TCP/TLS handshake. With
+    # HTTP/2 the concurrent stop calls are multiplexed over one ARM connection.
+    return httpx.Client(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_PARALLEL_STOPS, max_keepalive_connections=MAX_PARALLEL_STOPS),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_credential() -> DefaultAzureCredential:
+    return DefaultAzureCredential(exclude_interactive_browser_credential=True)
+
+
+def _get_arm_token() -> str:
+    with _TOKEN_LOCK:
+        if _TOKEN_CACHE["token"] and time.time() < _TOKEN_CACHE["expires_on"] - TOKEN_REFRESH_MARGIN_SECONDS:
+            return _TOKEN_CACHE["token"]
+        access_token = _get_credential().get_token(ARM_SCOPE)
+        _TOKEN_CACHE["token"] = access_token.token
+        _TOKEN_CACHE["expires_on"] = access_token.expires_on
+        return access_token.token
+
+
+def _arm_post(url: str, *, token: str, client: httpx.Client) -> dict[str, Any]:
     # ARM stop/start operations are async; 202/204 is normal.
-    resp = requests.post(
+    resp = client.post(
         url,
         headers={
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         },
-        timeout=30,
     )
     ok = 200 <= resp.status_code < 300
     payload: dict[str, Any] = {
         "ok": ok,
         "status_code": resp.status_code,
     }
-    if resp.text:
+    if resp.content:
         try:
-            payload["body"] = resp.json()
-        except Exception:
+            payload["body"] = orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
             payload["body"] = resp.text[:2000]
     return payload
 
@@ -50,22 +94,13 @@ def main(_req: func.HttpRequest) -> func.HttpResponse:
     try:
         subscription_id = _env("AUTO_STOP_SUBSCRIPTION_ID")
         resource_group = _env("AUTO_STOP_RESOURCE_GROUP")
-        container_apps_raw = os.environ.get("AUTO_STOP_CONTAINER_APP_NAMES", "").strip()
-        function_app_name = os.environ.get("AUTO_STOP_FUNCTION_APP_NAME", "").strip()
-        stop_self = os.environ.get("AUTO_STOP_STOP_FUNCTION_APP", "false").strip().lower() in {"1", "true", "yes"}
-
-        container_apps = [x.strip() for x in container_apps_raw.split(",") if x.strip()]
-        if not container_apps and not (stop_self and function_app_name):
+        if not CONTAINER_APPS and not (STOP_FUNCTION_APP and FUNCTION_APP_NAME):
             return func.HttpResponse(
                 "No targets configured. Set AUTO_STOP_CONTAINER_APP_NAMES and/or AUTO_STOP_STOP_FUNCTION_APP.",
                 status_code=400,
             )
 
-        ca_api_version = os.environ.get("AUTO_STOP_CONTAINERAPPS_API_VERSION", "2024-03-01").strip()
-        web_api_version = os.environ.get("AUTO_STOP_WEB_API_VERSION", "2024-04-01").strip()
-
-        cred = DefaultAzureCredential(exclude_interactive_browser_credential=True)
-        token = cred.get_token(ARM_SCOPE).token
+        token = _get_arm_token()
 
         results: dict[str, Any] = {
             "subscription_id": subscription_id,
@@ -76,33 +111,43 @@ def main(_req: func.HttpRequest) -> func.HttpResponse:
             },
         }
 
-        for name in container_apps:
-            url = (
-                "https://management.azure.com"
-                f"/subscriptions/{subscription_id}"
-                f"/resourceGroups/{resource_group}"
-                f"/providers/Microsoft.App/containerApps/{name}"
-                f"/stop?api-version={ca_api_version}"
-            )
-            results["stopped"]["container_apps"][name] = _arm_post(url, token=token)
+        resource_group_url = (
+            "https://management.azure.com"
+            f"/subscriptions/{subscription_id}"
+            f"/resourceGroups/{resource_group}/providers"
+        )
+        container_app_suffix = f"/stop?api-version={CONTAINERAPPS_API_VERSION}"
+        urls = {
+            name: f"{resource_group_url}/Microsoft.App/containerApps/{name}{container_app_suffix}"
+            for name in CONTAINER_APPS
+        }
 
-        if stop_self:
-            if not function_app_name:
+        function_app_url = None
+        if STOP_FUNCTION_APP:
+            if not FUNCTION_APP_NAME:
                 return func.HttpResponse(
                     "AUTO_STOP_FUNCTION_APP_NAME must be set when AUTO_STOP_STOP_FUNCTION_APP=true",
                     status_code=400,
                 )
-            url = (
-                "https://management.azure.com"
-                f"/subscriptions/{subscription_id}"
-                f"/resourceGroups/{resource_group}"
-                f"/providers/Microsoft.Web/sites/{function_app_name}"
-                f"/stop?api-version={web_api_version}"
+            function_app_url = (
+                f"{resource_group_url}/Microsoft.Web/sites/{FUNCTION_APP_NAME}/stop?api-version={WEB_API_VERSION}"
             )
-            results["stopped"]["function_app"] = _arm_post(url, token=token)
+
+        # Stop container apps concurrently; total latency is the slowest call, not the sum.
+        client = _get_client()
+        if urls:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_STOPS, len(urls))) as pool:
+                responses = list(pool.map(lambda url: _arm_post(url, token=token, client=client), urls.values()))
+            for name, response in zip(urls, responses):
+                results["stopped"]["container_apps"][name] = response
+
+        # The Function App may be the one running this handler: stop it last, once the
+        # other stops have completed.
+        if function_app_url:
+            results["stopped"]["function_app"] = _arm_post(function_app_url, token=token, client=client)
 
         return func.HttpResponse(
-            body=json.dumps(results, ensure_ascii=True, sort_keys=True),
+            body=orjson.dumps(results, option=orjson.OPT_SORT_KEYS),
             status_code=200,
             mimetype="application/json",
         )
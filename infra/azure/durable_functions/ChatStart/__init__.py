@@ -8,6 +8,8 @@ import azure.functions as func
 import azure.durable_functions as df
 import json
 
+from func_bootstrap import clean_text
+
 
 async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
     client = df.DurableOrchestrationClient(starter)
@@ -16,8 +18,8 @@ async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
     except ValueError:
         payload = {}
 
-    message = str(payload.get("message", "")).strip()
-    thread_id = str(payload.get("thread_id", "")).strip() or str(uuid4())
+    message = clean_text(payload.get("message"))
+    thread_id = clean_text(payload.get("thread_id")) or str(uuid4())
 
     try:
         instance_id = await client.start_new(
@@ -6,12 +6,22 @@ directory. Ensure the `src/` path is available for imports at runtime.
 
 from __future__ import annotations
 
+from functools import lru_cache
+import os
 from pathlib import Path
 import sys
 
 
+@lru_cache(maxsize=1)
 def ensure_src_on_path() -> None:
-    src_path = Path(__file__).resolve().parent / "src"
-    if src_path.exists() and str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
+    # Runs once per worker. CHATBOT_SRC skips path resolution when the layout is known.
+    src_path = os.environ.get("CHATBOT_SRC", "").strip() or str(Path(__file__).resolve().parent / "src")
+    if src_path not in sys.path and os.path.isdir(src_path):
+        sys.path.insert(0, src_path)
 
+
+def clean_text(value: object) -> str:
+    """Strip a JSON payload value, coercing only when it is not already a string."""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value or "").strip()
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from func_bootstrap import ensure_src_on_path
+from func_bootstrap import clean_text, ensure_src_on_path
 
 ensure_src_on_path()
 
 from chatbot_parking.interactive_flow import run_chat_turn
-from chatbot_parking.persistence import get_persistence
+from chatbot_parking.persistence import DeferredWrites, ThreadUpdateConflict, get_persistence
 
 
 def _durable_answer_question(_text: str) -> str:
@@ -18,8 +18,8 @@ def _durable_answer_question(_text: str) -> str:
 
 
 def main(payload: dict) -> dict:
-    message = str(payload.get("message", "")).strip()
-    thread_id = str(payload.get("thread_id", "")).strip() or str(uuid4())
+    message = clean_text(payload.get("message"))
+    thread_id = clean_text(payload.get("thread_id")) or str(uuid4())
 
     if not message:
         return {
@@ -30,14 +30,26 @@ def main(payload: dict) -> dict:
         }
 
     persistence = get_persistence()
-    prior_state = persistence.get_thread(thread_id)
-    result, next_state = run_chat_turn(
-        message=message,
-        state=prior_state,
-        persistence=persistence,
-        answer_question=_durable_answer_question,
-    )
-    persistence.upsert_thread(thread_id, next_state)
+    attempts: list[DeferredWrites] = []
+
+    def turn(prior_state: dict | None):
+        # update_thread may re-run the turn on a conflict; approval and reservation
+        # writes wait until one attempt's thread state has been stored.
+        attempts.append(DeferredWrites(persistence))
+        return run_chat_turn(
+            message=message,
+            state=prior_state,
+            persistence=attempts[-1],
+            answer_question=_durable_answer_question,
+        )
+
+    try:
+        result = persistence.update_thread(thread_id, turn)
+    except ThreadUpdateConflict:
+        # update_thread already retried; answer instead of failing the orchestration.
+        result = {"response": "This conversation was updated from another session. Please resend your message."}
+    else:
+        attempts[-1].flush()
 
     response = {
         **result,
@@ -1,53 +1,92 @@
 #!/usr/bin/env python3
-"""Simple concurrent load test for /chat/message and /admin endpoints."""
+"""Simple concurrent load test for /chat/message and /admin endpoints (asyncio + aiohttp)."""
 
 from __future__ import annotations
 
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import statistics
 import time
-from urllib import error, request
 import json
 
+import aiohttp
 
-def _post_json(url: str, payload: dict, headers: dict[str, str] | None = None) -> tuple[int, float]:
-    req = request.Request(
+try:
+    import uvloop
+except ImportError:  # Optional; the default asyncio loop is used instead.
+    uvloop = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional; the stdlib summary below is used instead.
+    np = None
+
+
+async def _post_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    body: bytes,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, float]:
+    started = time.perf_counter()
+    async with session.post(
         url,
-        data=json.dumps(payload).encode("utf-8"),
+        data=body,
         headers={"Content-Type": "application/json", **(headers or {})},
-        method="POST",
-    )
-    started = time.perf_counter()
-    with request.urlopen(req, timeout=20) as response:
+    ) as response:
+        await response.read()
         latency_ms = (time.perf_counter() - started) * 1000.0
         return response.status, latency_ms
 
 
-def _get(url: str, headers: dict[str, str] | None = None) -> tuple[int, float]:
-    req = request.Request(url, headers=headers or {}, method="GET")
+async def _get(session: aiohttp.ClientSession, url: str, headers: dict[str, str] | None = None) -> tuple[int, float]:
     started = time.perf_counter()
-    with request.urlopen(req, timeout=20) as response:
+    async with session.get(url, headers=headers or {}) as response:
+        await response.read()
         latency_ms = (time.perf_counter() - started) * 1000.0
         return response.status, latency_ms
 
 
-def _percentile(values: list[float], q: float) -> float:
+def _percentiles(values: list[float], qs: tuple[float, ...]) -> list[float]:
+    # One sort for all quantiles; linear interpolation matches numpy.percentile's default.
     if not values:
-        return 0.0
+        return [0.0 for _ in qs]
     ordered = sorted(values)
-    idx = int((len(ordered) - 1) * q)
-    return ordered[idx]
-
-
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Load test parking chatbot UI API")
-    parser.add_argument("--base-url", required=True, help="Base URL, e.g. https://...azurecontainerapps.io")
-    parser.add_argument("--requests", type=int, default=50, help="Number of requests")
-    parser.add_argument("--concurrency", type=int, default=10, help="Parallel workers")
-    parser.add_argument("--admin-token", default="", help="Optional x-api-token for /admin/requests checks")
-    args = parser.parse_args()
-
+    result = []
+    for q in qs:
+        k = (len(ordered) - 1) * q
+        f = int(k)
+        c = min(f + 1, len(ordered) - 1)
+        result.append(ordered[f] + (ordered[c] - ordered[f]) * (k - f))
+    return result
+
+
+def _summarize(values: list[float]) -> dict[str, float]:
+    if np is not None:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "avg": float(arr.mean()),
+            "std": float(arr.std()),
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+        }
+    p50, p95, p99 = _percentiles(values, (0.50, 0.95, 0.99))
+    return {
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "avg": statistics.fmean(values),
+        "std": statistics.pstdev(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+async def _run(args: argparse.Namespace) -> tuple[list[float], int, int]:
     chat_url = f"{args.base_url.rstrip('/')}/chat/message"
     admin_url = f"{args.base_url.rstrip('/')}/admin/requests"
     headers = {"x-api-token": args.admin_token} if args.admin_token else None
@@ -55,33 +94,59 @@ def main() -> None:
     latencies: list[float] = []
     successes = 0
     failures = 0
-
-    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
-        futures = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(call) -> tuple[int, float]:
+        async with semaphore:
+            return await call
+
+    # One session for the whole run so connections are reused across requests.
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=20)) as session:
+        # Only thread_id varies, so the body is a pre-encoded template.
+        body_prefix = b'{"message":' + json.dumps("What are your working hours?").encode("utf-8") + b',"thread_id":"load-'
+        calls = []
         for i in range(args.requests):
-            payload = {"message": "What are your working hours?", "thread_id": f"load-{i}"}
-            futures.append(pool.submit(_post_json, chat_url, payload))
+            body = body_prefix + str(i).encode("ascii") + b'"}'
+            calls.append(limited(_post_json(session, chat_url, body)))
             if i % 10 == 0:
-                futures.append(pool.submit(_get, admin_url, headers))
-
-        for future in as_completed(futures):
-            try:
-                status, latency_ms = future.result()
-                latencies.append(latency_ms)
-                if 200 <= status < 300:
-                    successes += 1
-                else:
-                    failures += 1
-            except error.HTTPError:
+                calls.append(limited(_get(session, admin_url, headers)))
+
+        for result in await asyncio.gather(*calls, return_exceptions=True):
+            if isinstance(result, BaseException):
                 failures += 1
-            except Exception:
+                continue
+            status, latency_ms = result
+            latencies.append(latency_ms)
+            if 200 <= status < 300:
+                successes += 1
+            else:
                 failures += 1
 
+    return latencies, successes, failures
+
+
+def _run_event_loop(coro):
+    # uvloop's libuv loop keeps the client from becoming the bottleneck at high concurrency.
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test parking chatbot UI API")
+    parser.add_argument("--base-url", required=True, help="Base URL, e.g. https://...azurecontainerapps.io")
+    parser.add_argument("--requests", type=int, default=50, help="Number of requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight")
+    parser.add_argument("--admin-token", default="", help="Optional x-api-token for /admin/requests checks")
+    args = parser.parse_args()
+
+    latencies, successes, failures = _run_event_loop(_run(args))
+
     print(f"total={len(latencies)} success={successes} failed={failures}")
     if latencies:
-        print(f"p50_ms={_percentile(latencies, 0.50):.1f}")
-        print(f"p95_ms={_percentile(latencies, 0.95):.1f}")
-        print(f"avg_ms={statistics.fmean(latencies):.1f}")
+        for name, value in _summarize(latencies).items():
+            print(f"{name}_ms={value:.1f}")
 
 
 if __name__ == "__main__":
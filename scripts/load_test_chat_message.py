@@ -3,7 +3,10 @@
 
 Why this exists:
 - Stage 4 review asked for system/load testing.
-- Keep dependencies at zero (stdlib only) so it can run anywhere.
+- Keep dependencies at zero (stdlib only) so it can run anywhere. When aiohttp is
+  installed, requests are driven from one asyncio event loop instead of a thread pool;
+  uvloop, when installed, replaces the default event loop for that driver. When numpy
+  is installed, the latency summary is computed with it.
 
 Example:
   python scripts/load_test_chat_message.py --base-url http://localhost:8000 --requests 200 --concurrency 20
@@ -12,35 +15,89 @@ Example:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import concurrent.futures as futures
+import itertools
 import json
 import math
+import secrets
+import statistics
 import time
 import urllib.error
 import urllib.request
-from uuid import uuid4
 
+try:
+    import aiohttp
+except ImportError:  # Optional; fall back to the stdlib thread-pool driver.
+    aiohttp = None
 
-def _percentile(values: list[float], p: float) -> float | None:
+try:
+    import uvloop
+except ImportError:  # Optional; only used by the aiohttp driver.
+    uvloop = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional; the pure-stdlib summary is used instead.
+    np = None
+
+
+def _percentiles(values: list[float], ps: tuple[float, ...]) -> list[float | None]:
     if not values:
-        return None
+        return [None for _ in ps]
     ordered = sorted(values)
-    if len(ordered) == 1:
-        return ordered[0]
-    k = (len(ordered) - 1) * p
-    f = int(math.floor(k))
-    c = int(math.ceil(k))
-    if f == c:
-        return ordered[f]
-    return ordered[f] + (ordered[c] - ordered[f]) * (k - f)
-
-
-def _post_chat_message(*, base_url: str, message: str, thread_id: str, timeout: float) -> tuple[bool, int | None, float]:
-    url = f"{base_url.rstrip('/')}/chat/message"
-    payload = {"message": message, "thread_id": thread_id}
+    result: list[float | None] = []
+    for p in ps:
+        k = (len(ordered) - 1) * p
+        f = int(math.floor(k))
+        c = int(math.ceil(k))
+        if f == c:
+            result.append(ordered[f])
+        else:
+            result.append(ordered[f] + (ordered[c] - ordered[f]) * (k - f))
+    return result
+
+
+def _summarize(values: list[float]) -> dict[str, float]:
+    if np is not None:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "mean": float(arr.mean()),
+            "stdev": float(arr.std()),
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+        }
+    p50, p95, p99 = _percentiles(values, (0.50, 0.95, 0.99))
+    return {
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "mean": statistics.fmean(values),
+        "stdev": statistics.pstdev(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def _chat_body_prefix(message: str, thread_prefix: str) -> bytes:
+    """Encode everything but the per-request index; thread ids are `<prefix>:<run id>:<index>`."""
+    # One random run id keeps thread ids unique across runs; the index keeps them unique within one.
+    thread_json = json.dumps(f"{thread_prefix}:{secrets.token_hex(8)}:")
+    return f'{{"message":{json.dumps(message)},"thread_id":{thread_json[:-1]}'.encode("utf-8")
+
+
+def _chat_body(prefix: bytes, i: int) -> bytes:
+    return prefix + b'%d"}' % i
+
+
+def _post_chat_message(*, url: str, body: bytes, timeout: float) -> tuple[bool, int | None, float]:
     req = urllib.request.Request(
         url,
-        data=json.dumps(payload).encode("utf-8"),
+        data=body,
         headers={"Content-Type": "application/json"},
         method="POST",
     )
@@ -63,11 +120,80 @@ def _post_chat_message(*, base_url: str, message: str, thread_id: str, timeout:
         return (False, None, elapsed)
 
 
+async def _post_chat_message_async(session, *, url: str, body: bytes) -> tuple[bool, int | None, float]:
+    start = time.perf_counter()
+    try:
+        async with session.post(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            await resp.read()  # ensure the body is consumed
+            elapsed = time.perf_counter() - start
+            return (200 <= resp.status < 300, int(resp.status), elapsed)
+    except Exception:
+        elapsed = time.perf_counter() - start
+        return (False, None, elapsed)
+
+
+async def _run_async(args: argparse.Namespace, total: int, concurrency: int) -> list[tuple[bool, int | None, float]]:
+    url = f"{args.base_url.rstrip('/')}/chat/message"
+    body_prefix = _chat_body_prefix(args.message, args.thread_prefix)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=float(args.timeout))
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def one(i: int) -> tuple[bool, int | None, float]:
+            async with semaphore:
+                return await _post_chat_message_async(
+                    session,
+                    url=url,
+                    body=_chat_body(body_prefix, i),
+                )
+
+        return await asyncio.gather(*(one(i) for i in range(total)))
+
+
+def _run_threaded(args: argparse.Namespace, total: int, concurrency: int) -> list[tuple[bool, int | None, float]]:
+    url = f"{args.base_url.rstrip('/')}/chat/message"
+    body_prefix = _chat_body_prefix(args.message, args.thread_prefix)
+    timeout = float(args.timeout)
+
+    def one(i: int) -> tuple[bool, int | None, float]:
+        return _post_chat_message(
+            url=url,
+            body=_chat_body(body_prefix, i),
+            timeout=timeout,
+        )
+
+    # Keep at most `concurrency` futures alive instead of submitting all `total` up front.
+    results: list[tuple[bool, int | None, float]] = []
+    indexes = iter(range(total))
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = {executor.submit(one, i) for i in itertools.islice(indexes, concurrency)}
+        while in_flight:
+            done, in_flight = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                results.append(future.result())
+            for i in itertools.islice(indexes, len(done)):
+                in_flight.add(executor.submit(one, i))
+    return results
+
+
+def _run_event_loop(coro):
+    # uvloop's libuv loop keeps the client from becoming the bottleneck at high concurrency.
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Load test /chat/message endpoint (stdlib only).")
+    parser = argparse.ArgumentParser(description="Load test /chat/message endpoint (stdlib only; aiohttp optional).")
     parser.add_argument("--base-url", default="http://localhost:8000", help="Base URL (default: http://localhost:8000)")
     parser.add_argument("--requests", type=int, default=100, help="Total requests (default: 100)")
-    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent workers (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight (default: 10)")
     parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds (default: 10)")
     parser.add_argument("--message", default="What are your working hours?", help="Message to send")
     parser.add_argument("--thread-prefix", default="load", help="Thread id prefix")
@@ -80,26 +206,19 @@ def main() -> int:
     ok_count = 0
     status_counts: dict[str, int] = {}
 
-    def one(i: int) -> tuple[bool, int | None, float]:
-        return _post_chat_message(
-            base_url=args.base_url,
-            message=args.message,
-            thread_id=f"{args.thread_prefix}:{uuid4()}:{i}",
-            timeout=float(args.timeout),
-        )
-
     started_at = time.perf_counter()
-    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
-        for ok, status, elapsed in executor.map(one, range(total)):
-            latencies.append(elapsed)
-            if ok:
-                ok_count += 1
-            key = str(status) if status is not None else "error"
-            status_counts[key] = status_counts.get(key, 0) + 1
+    if aiohttp is not None:
+        results = _run_event_loop(_run_async(args, total, concurrency))
+    else:
+        results = _run_threaded(args, total, concurrency)
+    for ok, status, elapsed in results:
+        latencies.append(elapsed)
+        if ok:
+            ok_count += 1
+        key = str(status) if status is not None else "error"
+        status_counts[key] = status_counts.get(key, 0) + 1
 
     duration = time.perf_counter() - started_at
-    p50 = _percentile(latencies, 0.50)
-    p95 = _percentile(latencies, 0.95)
     rps = total / duration if duration > 0 else float("inf")
 
     print("Load test results")
@@ -108,10 +227,9 @@ def main() -> int:
     print(f"- Concurrency: {concurrency}")
     print(f"- Duration: {duration:.2f}s")
     print(f"- Throughput: {rps:.2f} req/s")
-    if p50 is not None:
-        print(f"- Latency p50: {p50*1000:.1f} ms")
-    if p95 is not None:
-        print(f"- Latency p95: {p95*1000:.1f} ms")
+    if latencies:
+        for name, value in _summarize(latencies).items():
+            print(f"- Latency {name}: {value*1000:.1f} ms")
     print(f"- Success: {ok_count}/{total}")
     print(f"- Status counts: {status_counts}")
 
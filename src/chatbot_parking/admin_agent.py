@@ -1,175 +1,442 @@
 """Human-in-the-loop admin agent simulation with MCP tool integration."""
 
+import asyncio
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime, timezone
-import json
+from functools import lru_cache
+import logging
 import os
+import threading
 import time
-from typing import Optional
-from urllib import request
+from typing import Awaitable, Callable, Optional
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from chatbot_parking.admin_store import (
+    async_decision_waiter,
     create_admin_request,
+    decision_waiter,
     get_admin_decision,
-    post_admin_decision,
 )
 from chatbot_parking.chatbot import ReservationRequest
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+# Decision polling starts at INITIAL_POLL_DELAY and grows by POLL_BACKOFF up to ADMIN_POLL_INTERVAL.
+INITIAL_POLL_DELAY = 0.05
+POLL_BACKOFF = 1.7
+# Upper bound for the doubling pause used while the admin API is failing.
+ERROR_BACKOFF_MAX = 5.0
+# With ADMIN_BATCH_POLLS, decision polls arriving within this window share one GET.
+DECISION_BATCH_WINDOW = 0.01
+DECISION_BATCH_MAX = 20
+AUTO_APPROVE_NOTES = "Auto-approved via configured demo mode"
+
+
+@dataclass(frozen=True, slots=True)
 class AdminDecision:
     approved: bool
     decided_at: str
     notes: Optional[str] = None
 
 
-def _build_headers() -> dict:
+@dataclass(frozen=True, slots=True)
+class AdminConfig:
+    admin_url: str | None
+    auto_approve: bool
+    poll_interval: float
+    poll_timeout: float
+    api_token: str | None
+    batch_polls: bool
+    long_poll_seconds: float
+
+
+@lru_cache(maxsize=1)
+def get_admin_config() -> AdminConfig:
+    return AdminConfig(
+        admin_url=os.getenv("ADMIN_API_URL", "").rstrip("/") or None,
+        auto_approve=os.getenv("ADMIN_AUTO_APPROVE", "false").lower() == "true",
+        poll_interval=float(os.getenv("ADMIN_POLL_INTERVAL", "1.0")),
+        poll_timeout=float(os.getenv("ADMIN_POLL_TIMEOUT", "10.0")),
+        api_token=os.getenv("ADMIN_UI_TOKEN") or os.getenv("ADMIN_API_TOKEN"),
+        batch_polls=os.getenv("ADMIN_BATCH_POLLS", "false").strip().lower() in {"1", "true", "yes", "on"},
+        long_poll_seconds=float(os.getenv("ADMIN_LONG_POLL_SECONDS", "0")),
+    )
+
+
+@lru_cache(maxsize=4)
+def _headers_for(token: str | None) -> dict:
+    # Shared, read-only header dict per token; requests merges it without mutating it.
     headers = {"Content-Type": "application/json"}
-    token = os.getenv("ADMIN_UI_TOKEN") or os.getenv("ADMIN_API_TOKEN")
     if token:
         headers["x-api-token"] = token
     return headers
 
 
-def _post_json(url: str, payload: dict) -> dict:
-    data = json.dumps(payload).encode("utf-8")
-    req = request.Request(url, data=data, headers=_build_headers())
-    with request.urlopen(req, timeout=5) as response:
-        return json.loads(response.read().decode("utf-8"))
+def _build_headers() -> dict:
+    return _headers_for(get_admin_config().api_token)
 
 
-def _get_json(url: str) -> dict:
-    req = request.Request(url, method="GET", headers=_build_headers())
-    with request.urlopen(req, timeout=5) as response:
-        return json.loads(response.read().decode("utf-8"))
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    # Keep-alive pool shared by all approvals; only idempotent GETs are retried.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
-def _request_via_store(reservation: ReservationRequest) -> str:
-    return create_admin_request(
-        {
-            "name": reservation.name,
-            "surname": reservation.surname,
-            "car_number": reservation.car_number,
-            "reservation_period": reservation.reservation_period,
-        }
-    )
+def _post_json(url: str, payload: dict) -> dict:
+    response = _get_session().post(url, data=orjson.dumps(payload), headers=_build_headers(), timeout=5)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
-def _poll_store_decision(request_id: str, poll_interval: float, poll_timeout: float) -> AdminDecision:
-    deadline = time.time() + poll_timeout
-    while time.time() < deadline:
-        decision = get_admin_decision(request_id)
-        if decision:
-            return AdminDecision(
-                approved=decision["approved"],
-                decided_at=decision["decided_at"],
-                notes=decision.get("notes"),
-            )
-        time.sleep(poll_interval)
+def _get_json(url: str, timeout: float = 5) -> dict:
+    response = _get_session().get(url, headers=_build_headers(), timeout=timeout)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
-    decided_at = datetime.now(timezone.utc).isoformat()
-    return AdminDecision(
-        approved=False,
-        decided_at=decided_at,
-        notes="No admin decision received before timeout.",
-    )
+
+def _request_via_store(reservation: ReservationRequest) -> str:
+    return create_admin_request(reservation.to_payload())
 
 
 def _request_via_http(reservation: ReservationRequest, admin_url: str) -> str:
     submit = _post_json(
-        f"{admin_url.rstrip('/')}/admin/request",
-        {
-            "name": reservation.name,
-            "surname": reservation.surname,
-            "car_number": reservation.car_number,
-            "reservation_period": reservation.reservation_period,
-        },
+        f"{admin_url}/admin/request",
+        reservation.to_payload(),
     )
     return submit["request_id"]
 
 
-def _poll_http_decision(request_id: str, admin_url: str, poll_interval: float, poll_timeout: float) -> AdminDecision:
-    deadline = time.time() + poll_timeout
-    while time.time() < deadline:
-        try:
-            decision = _get_json(f"{admin_url.rstrip('/')}/admin/decisions/{request_id}")
-            return AdminDecision(
-                approved=decision["approved"],
-                decided_at=decision["decided_at"],
-                notes=decision.get("notes"),
-            )
-        except Exception:
-            time.sleep(poll_interval)
+def _to_decision(decision: dict) -> AdminDecision:
+    return AdminDecision(
+        approved=decision["approved"],
+        decided_at=decision["decided_at"],
+        notes=decision.get("notes"),
+    )
+
 
-    decided_at = datetime.now(timezone.utc).isoformat()
+def _auto_approved_decision() -> AdminDecision:
+    return AdminDecision(
+        approved=True,
+        decided_at=datetime.now(timezone.utc).isoformat(),
+        notes=AUTO_APPROVE_NOTES,
+    )
+
+
+def _timeout_decision() -> AdminDecision:
     return AdminDecision(
         approved=False,
-        decided_at=decided_at,
+        decided_at=datetime.now(timezone.utc).isoformat(),
         notes="No admin decision received before timeout.",
     )
 
 
+def _submit_http(reservation: ReservationRequest, admin_url: str, auto_approve: bool) -> tuple[str, AdminDecision | None]:
+    """Create the approval request; returns the decision too when auto-approve settles it."""
+    logger.debug("Using admin API at %s", admin_url)
+    request_id = _request_via_http(reservation, admin_url)
+    if auto_approve:
+        decision = _post_json(
+            f"{admin_url}/admin/decision",
+            {
+                "request_id": request_id,
+                "approved": True,
+                "notes": AUTO_APPROVE_NOTES,
+            },
+        )
+        return request_id, _to_decision(decision)
+    return request_id, None
+
+
+def _submit_store(reservation: ReservationRequest) -> str:
+    logger.debug("Using in-process admin store")
+    return _request_via_store(reservation)
+
+
+class _DecisionBatcher:
+    """Coalesce decision polls from concurrent approvals into one GET /admin/decisions?ids=...
+
+    The first caller of a batch waits DECISION_BATCH_WINDOW for others to join, then
+    fetches for everyone; ids missing from the response are still pending.
+    """
+
+    def __init__(self, admin_url: str) -> None:
+        self._url = f"{admin_url}/admin/decisions"
+        self._lock = threading.Lock()
+        self._batch: dict[str, Future] = {}
+
+    def fetch(self, request_id: str) -> dict | None:
+        with self._lock:
+            batch = self._batch
+            future = batch.setdefault(request_id, Future())
+            leader = len(batch) == 1
+            if len(batch) >= DECISION_BATCH_MAX:
+                self._batch = {}
+        if leader:
+            time.sleep(DECISION_BATCH_WINDOW)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = {}
+            self._flush(batch)
+        return future.result()
+
+    def _flush(self, batch: dict[str, Future]) -> None:
+        try:
+            decisions = _get_json(f"{self._url}?ids={','.join(batch)}").get("decisions") or {}
+        except Exception as exc:
+            for future in batch.values():
+                future.set_exception(exc)
+            return
+        for request_id, future in batch.items():
+            future.set_result(decisions.get(request_id))
+
+
+@lru_cache(maxsize=4)
+def _get_batcher(admin_url: str) -> _DecisionBatcher:
+    return _DecisionBatcher(admin_url)
+
+
+# A decision fetch; it is passed the seconds left before the approval times out.
+DecisionFetch = Callable[[float], dict | None]
+
+
+def _decision_fetcher(request_id: str, admin_url: str | None) -> DecisionFetch:
+    if not admin_url:
+        return lambda _remaining: get_admin_decision(request_id)
+    if get_admin_config().batch_polls:
+        batcher = _get_batcher(admin_url)
+        return lambda _remaining: batcher.fetch(request_id)
+
+    decision_url = f"{admin_url}/admin/decisions/{request_id}"
+    long_poll = get_admin_config().long_poll_seconds
+
+    def fetch(remaining: float) -> dict | None:
+        url, request_timeout = decision_url, 5.0
+        # The server holds the GET open until a decision is posted or the wait elapses;
+        # the wait never runs past the approval deadline.
+        wait = min(long_poll, remaining)
+        if wait > 0:
+            url = f"{decision_url}/wait?timeout={wait:g}"
+            request_timeout += wait
+        try:
+            return _get_json(url, timeout=request_timeout)
+        except requests.HTTPError as exc:
+            # The admin API answers 404 until a decision is posted; anything else is a failure.
+            if exc.response is not None and exc.response.status_code == 404:
+                return None
+            raise
+
+    return fetch
+
+
+def _try_fetch(fetch: DecisionFetch, remaining: float) -> tuple[dict | None, bool]:
+    """Return (decision, failed); failed is True when the admin API could not be reached."""
+    try:
+        return fetch(remaining), False
+    except (requests.RequestException, ValueError):
+        logger.debug("Decision fetch failed", exc_info=True)
+        return None, True
+
+
+class _PollSchedule:
+    """Pauses between decision polls until poll_timeout elapses.
+
+    While the decision is pending, polling starts fast so quick decisions are seen
+    quickly, then backs off to poll_interval. While the admin API is failing, the
+    pause doubles up to ERROR_BACKOFF_MAX so an outage is not hammered.
+    """
+
+    def __init__(self, poll_interval: float, poll_timeout: float) -> None:
+        self._deadline = time.monotonic() + poll_timeout
+        self._poll_interval = poll_interval
+        self._delay = min(INITIAL_POLL_DELAY, poll_interval)
+        self._error_delay = poll_interval
+
+    def remaining(self) -> float:
+        return max(self._deadline - time.monotonic(), 0.0)
+
+    def next_pause(self, failed: bool) -> float | None:
+        remaining = self.remaining()
+        if remaining <= 0:
+            return None
+        if failed:
+            pause = self._error_delay
+            self._error_delay = min(self._error_delay * 2, max(ERROR_BACKOFF_MAX, self._poll_interval))
+        else:
+            pause = self._delay
+            self._delay = min(self._delay * POLL_BACKOFF, self._poll_interval)
+            self._error_delay = self._poll_interval
+        return min(pause, remaining)
+
+
+def _poll_decision(
+    fetch: DecisionFetch,
+    poll_interval: float,
+    poll_timeout: float,
+    wait: Callable[[float], object] = time.sleep,
+) -> AdminDecision:
+    schedule = _PollSchedule(poll_interval, poll_timeout)
+    decision, failed = _try_fetch(fetch, schedule.remaining())
+    while not decision:
+        pause = schedule.next_pause(failed)
+        if pause is None:
+            return _timeout_decision()
+        wait(pause)
+        decision, failed = _try_fetch(fetch, schedule.remaining())
+    return _to_decision(decision)
+
+
+async def _poll_decision_async(
+    fetch: DecisionFetch,
+    poll_interval: float,
+    poll_timeout: float,
+    wait: Callable[[float], Awaitable[object]] = asyncio.sleep,
+) -> AdminDecision:
+    schedule = _PollSchedule(poll_interval, poll_timeout)
+    decision, failed = await asyncio.to_thread(_try_fetch, fetch, schedule.remaining())
+    while not decision:
+        pause = schedule.next_pause(failed)
+        if pause is None:
+            return _timeout_decision()
+        await wait(pause)
+        decision, failed = await asyncio.to_thread(_try_fetch, fetch, schedule.remaining())
+    return _to_decision(decision)
+
+
+def _approve_auto(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    # In-process demo mode decides up front; skip creating and deciding a store record.
+    return _auto_approved_decision()
+
+
+def _approve_via_http(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    request_id, decision = _submit_http(reservation, cfg.admin_url, cfg.auto_approve)
+    if decision:
+        return decision
+    fetch = _decision_fetcher(request_id, cfg.admin_url)
+    return _poll_decision(fetch, cfg.poll_interval, cfg.poll_timeout)
+
+
+def _approve_via_store(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    request_id = _submit_store(reservation)
+    fetch = _decision_fetcher(request_id, None)
+    # In-process decisions wake the waiter immediately; polling still covers
+    # decisions written to a shared store by another process.
+    with decision_waiter(request_id) as decided:
+        return _poll_decision(fetch, cfg.poll_interval, cfg.poll_timeout, wait=decided.wait)
+
+
+async def _approve_auto_async(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    return _auto_approved_decision()
+
+
+async def _approve_via_http_async(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    request_id, decision = await asyncio.to_thread(_submit_http, reservation, cfg.admin_url, cfg.auto_approve)
+    if decision:
+        return decision
+    fetch = _decision_fetcher(request_id, cfg.admin_url)
+    return await _poll_decision_async(fetch, cfg.poll_interval, cfg.poll_timeout)
+
+
+async def _approve_via_store_async(reservation: ReservationRequest, cfg: AdminConfig) -> AdminDecision:
+    request_id = await asyncio.to_thread(_submit_store, reservation)
+    fetch = _decision_fetcher(request_id, None)
+
+    async with async_decision_waiter(request_id) as decided:
+
+        async def wait(pause: float) -> None:
+            try:
+                await asyncio.wait_for(decided.wait(), pause)
+            except asyncio.TimeoutError:
+                pass
+
+        return await _poll_decision_async(fetch, cfg.poll_interval, cfg.poll_timeout, wait=wait)
+
+
+_BACKENDS: dict[str, Callable[[ReservationRequest, AdminConfig], AdminDecision]] = {
+    "auto": _approve_auto,
+    "http": _approve_via_http,
+    "store": _approve_via_store,
+}
+
+_ASYNC_BACKENDS: dict[str, Callable[[ReservationRequest, AdminConfig], Awaitable[AdminDecision]]] = {
+    "auto": _approve_auto_async,
+    "http": _approve_via_http_async,
+    "store": _approve_via_store_async,
+}
+
+
+def _select_backend(cfg: AdminConfig) -> str:
+    if cfg.admin_url:
+        return "http"
+    return "auto" if cfg.auto_approve else "store"
+
+
 def request_admin_approval(reservation: ReservationRequest) -> AdminDecision:
     """
     Submit a reservation to the admin system (either via MCP or HTTP API when configured).
     """
-    admin_url = os.getenv("ADMIN_API_URL")
-    auto_approve = os.getenv("ADMIN_AUTO_APPROVE", "false").lower() == "true"
-    poll_interval = float(os.getenv("ADMIN_POLL_INTERVAL", "1.0"))
-    poll_timeout = float(os.getenv("ADMIN_POLL_TIMEOUT", "10.0"))
-
-    if admin_url:
-        request_id = _request_via_http(reservation, admin_url)
-        if auto_approve:
-            decision = _post_json(
-                f"{admin_url.rstrip('/')}/admin/decision",
-                {
-                    "request_id": request_id,
-                    "approved": True,
-                    "notes": "Auto-approved via configured demo mode",
-                },
-            )
-            return AdminDecision(
-                approved=decision["approved"],
-                decided_at=decision["decided_at"],
-                notes=decision.get("notes"),
-            )
-        return _poll_http_decision(request_id, admin_url, poll_interval, poll_timeout)
+    cfg = get_admin_config()
+    return _BACKENDS[_select_backend(cfg)](reservation, cfg)
 
-    request_id = _request_via_store(reservation)
-    if auto_approve:
-        decision = post_admin_decision(
-            request_id=request_id,
-            approved=True,
-            notes="Auto-approved via configured demo mode",
-        )
-        if decision:
-            return AdminDecision(
-                approved=decision["approved"],
-                decided_at=decision["decided_at"],
-                notes=decision.get("notes"),
-            )
 
-    return _poll_store_decision(request_id, poll_interval, poll_timeout)
+async def request_admin_approval_async(reservation: ReservationRequest) -> AdminDecision:
+    """Async variant of request_admin_approval; waits without holding a worker thread."""
+    cfg = get_admin_config()
+    return await _ASYNC_BACKENDS[_select_backend(cfg)](reservation, cfg)
 
 
-@tool
-def request_admin_approval_tool(
-    name: str, surname: str, car_number: str, reservation_period: str
-) -> dict:
-    """LangChain tool wrapper for admin approval of a reservation via MCP."""
-    decision = request_admin_approval(
-        ReservationRequest(
-            name=name,
-            surname=surname,
-            car_number=car_number,
-            reservation_period=reservation_period,
-        )
-    )
+def _decision_to_dict(decision: AdminDecision) -> dict:
     return {
         "approved": decision.approved,
         "decided_at": decision.decided_at,
         "notes": decision.notes,
     }
+
+
+def _approve_reservation(name: str, surname: str, car_number: str, reservation_period: str) -> dict:
+    """LangChain tool wrapper for admin approval of a reservation via MCP."""
+    return _decision_to_dict(
+        request_admin_approval(
+            ReservationRequest(
+                name=name,
+                surname=surname,
+                car_number=car_number,
+                reservation_period=reservation_period,
+            )
+        )
+    )
+
+
+async def _approve_reservation_async(name: str, surname: str, car_number: str, reservation_period: str) -> dict:
+    return _decision_to_dict(
+        await request_admin_approval_async(
+            ReservationRequest(
+                name=name,
+                surname=surname,
+                car_number=car_number,
+                reservation_period=reservation_period,
+            )
+        )
+    )
+
+
+# invoke() runs the sync path; ainvoke() awaits the async one instead of parking a thread.
+request_admin_approval_tool = StructuredTool.from_function(
+    func=_approve_reservation,
+    coroutine=_approve_reservation_async,
+    name="request_admin_approval_tool",
+)
@@ -1,21 +1,37 @@
 """Admin REST API for approving or rejecting reservations."""
 
-from typing import Optional
+from typing import Any, Optional
 
+import asyncio
 import os
 
-from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+import orjson
 from pydantic import BaseModel
 
 from chatbot_parking.admin_store import (
     create_admin_request,
     get_admin_decision,
+    get_admin_decisions,
     get_admin_request,
     list_pending_requests,
     post_admin_decision,
+    wait_for_admin_decision,
 )
 
-app = FastAPI(title="Parking Admin API")
+
+class _OrjsonResponse(JSONResponse):
+    # Encodes route results with orjson. Defined locally because FastAPI's own
+    # ORJSONResponse is deprecated in recent releases.
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title="Parking Admin API", default_response_class=_OrjsonResponse)
+
+MAX_DECISION_BATCH = 100
+MAX_DECISION_WAIT_SECONDS = 60.0
 
 
 def _require_admin_token(x_api_token: str | None = Header(default=None)) -> None:
@@ -73,9 +89,34 @@ def list_requests(_auth: None = Depends(_require_admin_token)) -> dict:
     return {"pending": list_pending_requests()}
 
 
+@app.get("/admin/decisions")
+def get_decisions(ids: str = Query(...), _auth: None = Depends(_require_admin_token)) -> dict:
+    """Batch decision lookup for comma-separated ids; pending ids are left out."""
+    request_ids = [request_id for request_id in ids.split(",") if request_id]
+    if len(request_ids) > MAX_DECISION_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DECISION_BATCH} ids per request")
+    return {"decisions": get_admin_decisions(request_ids)}
+
+
 @app.get("/admin/decisions/{request_id}")
 def get_decision(request_id: str, _auth: None = Depends(_require_admin_token)) -> dict:
     decision = get_admin_decision(request_id)
     if decision is None:
         raise HTTPException(status_code=404, detail="Decision not found")
     return {"request_id": request_id, **decision}
+
+
+@app.get("/admin/decisions/{request_id}/wait")
+async def wait_for_decision(
+    request_id: str,
+    timeout: float = Query(default=20.0, ge=0, le=MAX_DECISION_WAIT_SECONDS),
+    _auth: None = Depends(_require_admin_token),
+) -> dict:
+    """Long-poll variant of get_decision: responds as soon as a decision is posted."""
+    if not await asyncio.to_thread(get_admin_request, request_id):
+        raise HTTPException(status_code=404, detail="Request not found")
+
+    decision = await wait_for_admin_decision(request_id, timeout)
+    if decision is None:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    return {"request_id": request_id, **decision}
@@ -2,20 +2,121 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
 
 from chatbot_parking.persistence import IN_MEMORY_PERSISTENCE, get_persistence
 
 # Backward compatibility alias for tests that inspect in-memory state.
 STORE = IN_MEMORY_PERSISTENCE.approvals
 
+# Wakeup callbacks for decisions posted from this process, keyed by request id. An id
+# can have several waiters (the agent's own wait plus admin long-polls).
+_DECISION_WAITERS: dict[str, list[Callable[[], None]]] = {}
+_DECISION_WAITERS_LOCK = threading.Lock()
+# How often wait_for_admin_decision re-reads a shared store while waiting.
+STORE_RECHECK_SECONDS = 1.0
+
+# Short-lived pending list shared by polling admin UIs; see list_pending_requests.
+_PENDING_CACHE: dict[str, Any] = {"persistence": None, "expires_at": 0.0, "items": [], "generation": 0}
+_PENDING_CACHE_LOCK = threading.Lock()
+
+
+@contextmanager
+def _registered_waiter(request_id: str, notify: Callable[[], None]) -> Iterator[None]:
+    with _DECISION_WAITERS_LOCK:
+        _DECISION_WAITERS.setdefault(request_id, []).append(notify)
+    try:
+        yield
+    finally:
+        with _DECISION_WAITERS_LOCK:
+            waiters = _DECISION_WAITERS.get(request_id, [])
+            if notify in waiters:
+                waiters.remove(notify)
+            if not waiters:
+                _DECISION_WAITERS.pop(request_id, None)
+
+
+@contextmanager
+def decision_waiter(request_id: str) -> Iterator[threading.Event]:
+    """Yield an event that is set when post_admin_decision decides request_id in this process.
+
+    Decisions written by other processes (shared Cosmos store) do not set it, so
+    callers should still re-check the store when the wait times out.
+    """
+    event = threading.Event()
+    with _registered_waiter(request_id, event.set):
+        yield event
+
+
+@asynccontextmanager
+async def async_decision_waiter(request_id: str) -> AsyncIterator[asyncio.Event]:
+    """Async counterpart of decision_waiter; the event is set on the caller's loop."""
+    event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    with _registered_waiter(request_id, lambda: loop.call_soon_threadsafe(event.set)):
+        yield event
+
+
+async def wait_for_admin_decision(request_id: str, timeout: float) -> dict[str, Any] | None:
+    """Return the decision for request_id, waiting up to timeout seconds for one to be posted.
+
+    Decisions posted in this process wake the wait immediately; the store is also
+    re-read every STORE_RECHECK_SECONDS for decisions written by other processes.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    async with async_decision_waiter(request_id) as decided:
+        while True:
+            decision = await asyncio.to_thread(get_admin_decision, request_id)
+            remaining = deadline - loop.time()
+            if decision or remaining <= 0:
+                return decision
+            try:
+                await asyncio.wait_for(decided.wait(), min(remaining, STORE_RECHECK_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+
+
+def _invalidate_pending_cache() -> None:
+    with _PENDING_CACHE_LOCK:
+        _PENDING_CACHE["expires_at"] = 0.0
+        _PENDING_CACHE["generation"] += 1
+
 
 def create_admin_request(payload: dict[str, Any]) -> str:
-    return get_persistence().create_approval(payload)
+    request_id = get_persistence().create_approval(payload)
+    _invalidate_pending_cache()
+    return request_id
 
 
 def list_pending_requests() -> list[dict[str, Any]]:
-    return get_persistence().list_pending_approvals()
+    """List pending approvals, reusing a recent result when ADMIN_PENDING_CACHE_TTL is set.
+
+    Changes made through this module invalidate the cache immediately; changes made
+    elsewhere (another process on a shared store) show up within the TTL.
+    """
+    persistence = get_persistence()
+    ttl = float(os.getenv("ADMIN_PENDING_CACHE_TTL", "0"))
+    if ttl <= 0:
+        return persistence.list_pending_approvals()
+
+    now = time.monotonic()
+    with _PENDING_CACHE_LOCK:
+        if _PENDING_CACHE["persistence"] is persistence and now < _PENDING_CACHE["expires_at"]:
+            return list(_PENDING_CACHE["items"])
+        generation = _PENDING_CACHE["generation"]
+
+    items = persistence.list_pending_approvals()
+    with _PENDING_CACHE_LOCK:
+        # Skip storing a list that a concurrent create/decision has already made stale.
+        if _PENDING_CACHE["generation"] == generation:
+            _PENDING_CACHE.update(persistence=persistence, expires_at=now + ttl, items=items)
+    return list(items)
 
 
 def get_admin_request(request_id: str) -> dict[str, Any] | None:
@@ -29,9 +130,27 @@ def get_admin_decision(request_id: str) -> dict[str, Any] | None:
     return request.get("decision")
 
 
+def get_admin_decisions(request_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Return decisions for the decided ids among request_ids; pending or unknown ids are omitted."""
+    persistence = get_persistence()
+    decisions = {}
+    for request_id in request_ids:
+        request = persistence.get_approval(request_id)
+        if request and request.get("decision"):
+            decisions[request_id] = request["decision"]
+    return decisions
+
+
 def post_admin_decision(request_id: str, approved: bool, notes: str | None = None) -> dict[str, Any] | None:
-    return get_persistence().set_approval_decision(
+    decision = get_persistence().set_approval_decision(
         request_id=request_id,
         approved=approved,
         notes=notes,
     )
+    if decision is not None:
+        _invalidate_pending_cache()
+        with _DECISION_WAITERS_LOCK:
+            waiters = list(_DECISION_WAITERS.get(request_id, ()))
+        for notify in waiters:
+            notify()
+    return decision
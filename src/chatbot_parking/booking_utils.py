@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta
+from functools import lru_cache
 import re
 from typing import Any
 
 BOOKING_FIELDS: list[str] = ["name", "surname", "car_number", "reservation_period"]
+# Wizard order as a lookup: field -> the field asked for next (None after the last one).
+NEXT_BOOKING_FIELD: dict[str, str | None] = dict(zip(BOOKING_FIELDS, [*BOOKING_FIELDS[1:], None]))
 
 NAME_RE = re.compile(r"^[A-Za-z][A-Za-z' -]{1,49}$")
 CAR_RE = re.compile(r"^[A-Z0-9-]{4,12}$")
@@ -14,6 +17,14 @@ PERIOD_RE = re.compile(
     r"^\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})\s+to\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})\s*$",
     re.IGNORECASE,
 )
+STRUCTURED_DETAIL_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    ("name", re.compile(r"(?:^|[\s,;])name[:=]\s*([A-Za-z][A-Za-z' -]{1,49})", re.IGNORECASE)),
+    ("surname", re.compile(r"(?:^|[\s,;])surname[:=]\s*([A-Za-z][A-Za-z' -]{1,49})", re.IGNORECASE)),
+    ("car_number", re.compile(r"(?:^|[\s,;])(?:car|plate|car_number)[:=]\s*([A-Za-z0-9 -]{4,20})", re.IGNORECASE)),
+    ("reservation_period", re.compile(r"(?:^|[\s,;])(?:period|reservation_period)[:=]\s*([^;]+)$", re.IGNORECASE)),
+]
+# Matches whenever any STRUCTURED_DETAIL_PATTERNS entry can ("surname:" contains "name:").
+_STRUCTURED_DETAIL_KEY_RE = re.compile(r"(?:name|car|plate|car_number|period)[:=]", re.IGNORECASE)
 BOOKING_KEYWORDS = [
     "book",
     "booking",
@@ -28,30 +39,50 @@ BOOKING_KEYWORDS = [
 ]
 
 
+# A keyword that contains another keyword can never be the only match ("booking"
+# contains "book"), so only the minimal ones need scanning.
+_BOOKING_KEYWORD_SCAN = tuple(
+    word for word in BOOKING_KEYWORDS if not any(other != word and other in word for other in BOOKING_KEYWORDS)
+)
+
+
 def is_booking_keyword_intent(message: str) -> bool:
     lowered = message.lower()
-    return any(word in lowered for word in BOOKING_KEYWORDS)
+    return any(word in lowered for word in _BOOKING_KEYWORD_SCAN)
+
 
+def _clock_time(value: str) -> time:
+    # `value` is an already-matched HH:MM; out-of-range parts raise ValueError like strptime.
+    return time(int(value[0:2]), int(value[3:5]))
 
+
+def _period_datetime(value: str) -> datetime:
+    # `value` is a PERIOD_RE group: YYYY-MM-DD, whitespace, HH:MM.
+    day, clock = value.split()
+    return datetime(int(day[0:4]), int(day[5:7]), int(day[8:10]), int(clock[0:2]), int(clock[3:5]))
+
+
+# One booking turn validates, range-checks and suggests alternatives for the same
+# period string; the results are immutable, so parse each distinct string once.
+@lru_cache(maxsize=1024)
 def _parse_period_or_none(value: str) -> tuple[datetime, datetime] | None:
     match = PERIOD_RE.match(value)
     if not match:
         return None
-    start = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M")
-    end = datetime.strptime(match.group(2), "%Y-%m-%d %H:%M")
-    return (start, end)
+    return (_period_datetime(match.group(1)), _period_datetime(match.group(2)))
 
 
 def parse_reservation_period(value: str) -> tuple[datetime, datetime] | None:
     return _parse_period_or_none(value)
 
 
+@lru_cache(maxsize=64)
 def parse_working_hours_window(working_hours: str) -> tuple[time, time] | None:
     match = re.search(r"(\d{2}:\d{2})\s*-\s*(\d{2}:\d{2})", working_hours)
     if not match:
         return None
-    start_hour = datetime.strptime(match.group(1), "%H:%M").time()
-    end_hour = datetime.strptime(match.group(2), "%H:%M").time()
+    start_hour = _clock_time(match.group(1))
+    end_hour = _clock_time(match.group(2))
     return (start_hour, end_hour)
 
 
@@ -152,16 +183,12 @@ def parse_structured_details(text: str) -> dict[str, str]:
     """Parse booking details from free-form but structured-like user input."""
     result: dict[str, str] = {}
     value = text.strip()
+    # Every pattern needs a "<key>:" or "<key>=" token; most chat messages have none.
+    if ("=" not in value and ":" not in value) or not _STRUCTURED_DETAIL_KEY_RE.search(value):
+        return result
 
-    patterns = {
-        "name": r"(?:^|[\s,;])name[:=]\s*([A-Za-z][A-Za-z' -]{1,49})",
-        "surname": r"(?:^|[\s,;])surname[:=]\s*([A-Za-z][A-Za-z' -]{1,49})",
-        "car_number": r"(?:^|[\s,;])(?:car|plate|car_number)[:=]\s*([A-Za-z0-9 -]{4,20})",
-        "reservation_period": r"(?:^|[\s,;])(?:period|reservation_period)[:=]\s*([^;]+)$",
-    }
-
-    for field, pattern in patterns.items():
-        match = re.search(pattern, value, re.IGNORECASE)
+    for field, pattern in STRUCTURED_DETAIL_PATTERNS:
+        match = pattern.search(value)
         if match:
             result[field] = match.group(1).strip()
 
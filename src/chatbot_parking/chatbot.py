@@ -1,12 +1,15 @@
 """Core chatbot logic for interacting with users."""
 
+import asyncio
 from dataclasses import dataclass, field
+from functools import lru_cache
 import os
 import re
-from typing import Optional
+import threading
+from typing import AsyncIterator, ClassVar, Optional
 
 from chatbot_parking.booking_utils import (
-    BOOKING_FIELDS,
+    NEXT_BOOKING_FIELD,
     apply_valid_parsed_details,
     is_booking_keyword_intent,
     next_missing_field,
@@ -15,45 +18,103 @@ from chatbot_parking.booking_utils import (
     parse_structured_details,
     validate_field,
 )
-from chatbot_parking.dynamic_data import get_dynamic_info
+from chatbot_parking.config import get_settings
+from chatbot_parking.dynamic_data import DynamicInfo, get_dynamic_info
 from chatbot_parking.guardrails import (
-    contains_prompt_injection,
-    is_system_prompt_request,
+    classify_guard,
     filter_sensitive,
     safe_output,
+    safe_output_stream,
 )
 from chatbot_parking.rag import (
     build_vector_store,
     classify_intent,
     generate_answer,
+    generate_answer_stream,
     generate_fallback_answer,
     keyword_context,
     retrieve,
 )
+from chatbot_parking.semantic_cache import SemanticCache
 
 
-@dataclass
+@dataclass(slots=True)
 class ReservationRequest:
     name: str
     surname: str
     car_number: str
     reservation_period: str
 
+    def to_payload(self) -> dict:
+        # Flat field copy; avoids dataclasses.asdict's recursive deep-copy walk.
+        return {
+            "name": self.name,
+            "surname": self.surname,
+            "car_number": self.car_number,
+            "reservation_period": self.reservation_period,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ConversationState:
     pending_field: Optional[str] = None
     collected: dict = field(default_factory=dict)
 
 
+_UNBUILT = object()
+
+
 class ParkingChatbot:
+    _PROMPTS: ClassVar[dict[str, str]] = {
+        "name": "Please provide your name.",
+        "surname": "Please provide your surname.",
+        "car_number": "What is your car number?",
+        "reservation_period": "What reservation period would you like (e.g., 2026-02-20 09:00 to 2026-02-20 18:00)?",
+    }
+
     def __init__(self) -> None:
-        # Avoid failing fast on startup if an embedding provider is unavailable.
-        # The chatbot can fall back to deterministic keyword-based answers.
+        # Built on first use: booking-only sessions never load the embedding model.
+        self._vector_store: object = _UNBUILT
+        self._vector_store_lock = threading.Lock()
+        # Opt-in: RAG_SEMANTIC_CACHE_SIZE > 0 reuses answers for near-duplicate questions.
+        cache_size = int(os.getenv("RAG_SEMANTIC_CACHE_SIZE", "0"))
+        self.answer_cache = (
+            SemanticCache(
+                cache_size,
+                threshold=float(os.getenv("RAG_SEMANTIC_CACHE_THRESHOLD", "0.92")),
+                ttl=float(os.getenv("RAG_SEMANTIC_CACHE_TTL", "60")),
+            )
+            if cache_size > 0
+            else None
+        )
+
+    @property
+    def vector_store(self):
+        if self._vector_store is _UNBUILT:
+            with self._vector_store_lock:
+                if self._vector_store is _UNBUILT:
+                    # Avoid failing if an embedding provider is unavailable.
+                    # The chatbot can fall back to deterministic keyword-based answers.
+                    try:
+                        self._vector_store = build_vector_store(insert_documents=False)
+                    except Exception:
+                        self._vector_store = None
+        return self._vector_store
+
+    @vector_store.setter
+    def vector_store(self, store) -> None:
+        self._vector_store = store
+
+    def _embed_for_cache(self, question: str) -> Optional[list[float]]:
+        if self.answer_cache is None:
+            return None
+        embedder = getattr(self.vector_store, "embeddings", None)
+        if embedder is None:
+            return None
         try:
-            self.vector_store = build_vector_store(insert_documents=False)
+            return embedder.embed_query(question)
         except Exception:
-            self.vector_store = None
+            return None
 
     def detect_intent(self, question: str) -> str:
         parsed = parse_structured_details(question)
@@ -72,16 +133,17 @@ class ParkingChatbot:
 
         return "info"
 
-    def answer_question(self, question: str) -> str:
-        max_chars = int(os.getenv("MAX_MESSAGE_CHARS", "2000"))
+    def _prepare_question(self, question: str) -> tuple[Optional[str], str]:
+        """Return (refusal, question_for_answer); refusal is set when guardrails reject the input."""
+        max_chars = get_settings().max_message_chars
         if max_chars > 0 and len(question) > max_chars:
-            return "Message is too long. Please shorten it and try again."
-
-        if is_system_prompt_request(question):
-            return "Sorry, I can't share internal instructions."
+            return "Message is too long. Please shorten it and try again.", question
 
-        if contains_prompt_injection(question):
-            return "Sorry, I can't help with that request."
+        verdict = classify_guard(question)
+        if verdict == "system_prompt":
+            return "Sorry, I can't share internal instructions.", question
+        if verdict == "prompt_injection":
+            return "Sorry, I can't help with that request.", question
 
         question_for_answer = question.strip()
         lowered = question_for_answer.lower().strip()
@@ -92,9 +154,10 @@ class ParkingChatbot:
             "terms and conditions",
         }:
             question_for_answer = "What are the parking rules and policies?"
+        return None, question_for_answer
 
-        dynamic = get_dynamic_info()
-        max_context = int(os.getenv("MAX_RAG_CONTEXT_CHARS", "6000"))
+    def _build_context(self, question_for_answer: str, query_embedding: Optional[list[float]]) -> tuple[str, list]:
+        max_context = get_settings().max_rag_context_chars
         context = ""
         retrieval_docs = []
         backstop_context = ""
@@ -108,10 +171,9 @@ class ParkingChatbot:
 
         if self.vector_store is not None:
             try:
-                retrieval = retrieve(question_for_answer, self.vector_store)
-                retrieval_docs = list(retrieval.documents)
-                snippets = [doc.page_content for doc in retrieval_docs]
-                safe_snippets = filter_sensitive(snippets)
+                retrieval = retrieve(question_for_answer, self.vector_store, embedding=query_embedding)
+                retrieval_docs = retrieval.documents
+                safe_snippets = filter_sensitive(doc.page_content for doc in retrieval_docs)
                 context = "\n".join(safe_snippets) if safe_snippets else ""
             except Exception:
                 # Embeddings/vector store failed. Fall back to deterministic context.
@@ -127,26 +189,118 @@ class ParkingChatbot:
 
         if max_context > 0 and len(context) > max_context:
             context = context[:max_context].rstrip()
-        dynamic_info = (
-            f"Current availability: {dynamic.available_spaces} spaces. "
-            f"Hours: {dynamic.working_hours}. Pricing: {dynamic.pricing}."
-        )
+        return context, retrieval_docs
+
+    @staticmethod
+    def _sources_suffix(retrieval_docs: list) -> str:
+        if not get_settings().rag_include_sources:
+            return ""
+        # dict keeps first-seen order while deduplicating in linear time.
+        source_ids: dict[str, None] = {}
+        for doc in retrieval_docs:
+            source_id = doc.metadata.get("source_id") or doc.metadata.get("id")
+            if source_id:
+                source_ids.setdefault(str(source_id), None)
+        return f"\n\nSources: {', '.join(source_ids)}" if source_ids else ""
+
+    def _finish_answer(
+        self,
+        question_for_answer: str,
+        context: str,
+        retrieval_docs: list,
+        dynamic: DynamicInfo,
+        query_embedding: Optional[list[float]],
+    ) -> str:
+        dynamic_info = dynamic.formatted
         try:
             response = generate_answer(question_for_answer, context, dynamic_info)
         except Exception:
             response = generate_fallback_answer(question_for_answer, dynamic_info)
-        if os.getenv("RAG_INCLUDE_SOURCES", "false").strip().lower() == "true":
-            source_ids: list[str] = []
-            for doc in retrieval_docs:
-                source_id = doc.metadata.get("source_id") or doc.metadata.get("id")
-                if source_id:
-                    rendered = str(source_id)
-                    if rendered not in source_ids:
-                        source_ids.append(rendered)
-            if source_ids:
-                response = f"{response}\n\nSources: {', '.join(source_ids)}"
-
-        return safe_output(response)
+        response = safe_output(response + self._sources_suffix(retrieval_docs))
+        if query_embedding is not None:
+            self.answer_cache.put(query_embedding, response)
+        return response
+
+    def answer_question(self, question: str) -> str:
+        refusal, question_for_answer = self._prepare_question(question)
+        if refusal is not None:
+            return refusal
+
+        query_embedding = self._embed_for_cache(question_for_answer)
+        if query_embedding is not None:
+            cached = self.answer_cache.get(query_embedding)
+            if cached is not None:
+                return cached
+
+        dynamic = get_dynamic_info()
+        context, retrieval_docs = self._build_context(question_for_answer, query_embedding)
+        return self._finish_answer(question_for_answer, context, retrieval_docs, dynamic, query_embedding)
+
+    async def answer_question_async(self, question: str) -> str:
+        """Async answer_question: the dynamic-data read overlaps retrieval instead of preceding it."""
+        refusal, question_for_answer = self._prepare_question(question)
+        if refusal is not None:
+            return refusal
+
+        query_embedding = await asyncio.to_thread(self._embed_for_cache, question_for_answer)
+        if query_embedding is not None:
+            cached = self.answer_cache.get(query_embedding)
+            if cached is not None:
+                return cached
+
+        # Both stages handle their own failures, so gather never sees an exception.
+        dynamic, (context, retrieval_docs) = await asyncio.gather(
+            asyncio.to_thread(get_dynamic_info),
+            asyncio.to_thread(self._build_context, question_for_answer, query_embedding),
+        )
+        return await asyncio.to_thread(
+            self._finish_answer, question_for_answer, context, retrieval_docs, dynamic, query_embedding
+        )
+
+    async def answer_question_stream(self, question: str) -> AsyncIterator[str]:
+        """Streaming answer_question: yields guardrail-checked sentences as the LLM produces them."""
+        refusal, question_for_answer = self._prepare_question(question)
+        if refusal is not None:
+            yield refusal
+            return
+
+        query_embedding = await asyncio.to_thread(self._embed_for_cache, question_for_answer)
+        if query_embedding is not None:
+            cached = self.answer_cache.get(query_embedding)
+            if cached is not None:
+                yield cached
+                return
+
+        dynamic, (context, retrieval_docs) = await asyncio.gather(
+            asyncio.to_thread(get_dynamic_info),
+            asyncio.to_thread(self._build_context, question_for_answer, query_embedding),
+        )
+        dynamic_info = dynamic.formatted
+        emitted: list[str] = []
+        stopped_early: list[bool] = []
+        try:
+            async for segment in safe_output_stream(
+                generate_answer_stream(question_for_answer, context, dynamic_info),
+                on_stop=lambda: stopped_early.append(True),
+            ):
+                emitted.append(segment)
+                yield segment
+        except Exception:
+            # Only fall back when nothing has been shown yet; a partial answer stays as is.
+            if emitted:
+                return
+            fallback = safe_output(generate_fallback_answer(question_for_answer, dynamic_info))
+            emitted.append(fallback)
+            yield fallback
+        if stopped_early:
+            # Refused or truncated: no sources after it, and nothing worth caching.
+            return
+
+        suffix = self._sources_suffix(retrieval_docs)
+        if suffix:
+            yield suffix
+        if query_embedding is not None:
+            self.answer_cache.put(query_embedding, safe_output("".join(emitted) + suffix))
 
     def start_reservation(self) -> ConversationState:
         return ConversationState(pending_field="name")
@@ -187,24 +341,10 @@ class ParkingChatbot:
         return (self._prompt_for_field(state.pending_field), None)
 
     def _next_field(self, current_field: str) -> Optional[str]:
-        try:
-            current_index = BOOKING_FIELDS.index(current_field)
-        except ValueError:
-            return None
-        return (
-            BOOKING_FIELDS[current_index + 1]
-            if current_index + 1 < len(BOOKING_FIELDS)
-            else None
-        )
+        return NEXT_BOOKING_FIELD.get(current_field)
 
     def _prompt_for_field(self, field: str) -> str:
-        prompts = {
-            "name": "Please provide your name.",
-            "surname": "Please provide your surname.",
-            "car_number": "What is your car number?",
-            "reservation_period": "What reservation period would you like (e.g., 2026-02-20 09:00 to 2026-02-20 18:00)?",
-        }
-        return prompts[field]
+        return self._PROMPTS[field]
 
     def _build_request(self, state: ConversationState) -> Optional[ReservationRequest]:
         if len(state.collected) < 4:
@@ -215,3 +355,9 @@ class ParkingChatbot:
             car_number=state.collected["car_number"],
             reservation_period=state.collected["reservation_period"],
         )
+
+
+@lru_cache(maxsize=1)
+def get_chatbot() -> ParkingChatbot:
+    """Process-wide chatbot; building the vector store is too costly to repeat per turn."""
+    return ParkingChatbot()
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 from collections.abc import Callable, Sequence
 
 from chatbot_parking.booking_utils import is_booking_keyword_intent, parse_structured_details
-from chatbot_parking.chatbot import ParkingChatbot
+from chatbot_parking.chatbot import ParkingChatbot, get_chatbot
 from chatbot_parking.orchestration import WorkflowState, build_graph, run_demo
 
 
@@ -32,13 +33,20 @@ def print_interactive_help() -> None:
 
 
 def run_demo_mode() -> None:
-    chatbot = ParkingChatbot()
+    chatbot = get_chatbot()
     print(chatbot.answer_question("What are the working hours and location?"))
     workflow_state = run_demo()
     print("Workflow response:", workflow_state.get("response"))
     print("Admin decision:", workflow_state.get("admin_decision"))
 
 
+async def _print_answer_stream(chatbot: ParkingChatbot, question: str) -> None:
+    # Print sentences as they arrive instead of waiting for the whole answer.
+    async for piece in chatbot.answer_question_stream(question):
+        print(piece, end="", flush=True)
+    print()
+
+
 def _run_booking_workflow(booking_inputs: list[str]) -> WorkflowState:
     workflow = build_graph().compile()
     return workflow.invoke(
@@ -81,42 +89,47 @@ def _run_booking_wizard(
 
 
 def run_interactive() -> None:
-    chatbot = ParkingChatbot()
+    chatbot = get_chatbot()
     print_interactive_help()
 
-    while True:
-        try:
-            user_input = input("You: ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\nExiting interactive mode.")
-            return
-
-        if not user_input:
-            continue
-        if user_input == "/exit":
-            print("Goodbye!")
-            return
-        if user_input == "/help":
-            print_interactive_help()
-            continue
-        if user_input == "/reset":
-            print("Booking wizard state reset.")
-            continue
+    # One event loop for the whole session instead of asyncio.run per line.
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                user_input = input("You: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting interactive mode.")
+                return
 
-        if is_reservation_intent(user_input):
-            booking_inputs, should_exit = _run_booking_wizard(input, print)
-            if should_exit:
+            if not user_input:
+                continue
+            if user_input == "/exit":
                 print("Goodbye!")
                 return
-            if booking_inputs is None:
+            if user_input == "/help":
+                print_interactive_help()
+                continue
+            if user_input == "/reset":
+                print("Booking wizard state reset.")
                 continue
 
-            workflow_state = _run_booking_workflow(booking_inputs)
-            print("Workflow response:", workflow_state.get("response"))
-            print("Admin decision:", workflow_state.get("admin_decision"))
-            continue
+            if is_reservation_intent(user_input):
+                booking_inputs, should_exit = _run_booking_wizard(input, print)
+                if should_exit:
+                    print("Goodbye!")
+                    return
+                if booking_inputs is None:
+                    continue
+
+                workflow_state = _run_booking_workflow(booking_inputs)
+                print("Workflow response:", workflow_state.get("response"))
+                print("Admin decision:", workflow_state.get("admin_decision"))
+                continue
 
-        print(chatbot.answer_question(user_input))
+            loop.run_until_complete(_print_answer_stream(chatbot, user_input))
+    finally:
+        loop.close()
 
 
 def run(argv: Sequence[str] | None = None) -> None:
@@ -7,9 +7,12 @@ from functools import lru_cache
 import os
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     vector_backend: str
+    vector_quantization: str
+    vector_index: str
+    hnsw_ef_search: int
     embeddings_provider: str
     embeddings_model: str
     llm_provider: str
@@ -24,12 +27,18 @@ class Settings:
     azure_openai_api_version: str
     eval_output_dir: str
     admin_api_token: str | None
+    max_message_chars: int
+    max_rag_context_chars: int
+    rag_include_sources: bool
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings(
         vector_backend=os.getenv("VECTOR_BACKEND", "faiss").lower(),
+        vector_quantization=os.getenv("VECTOR_QUANTIZATION", "none").strip().lower(),
+        vector_index=os.getenv("VECTOR_INDEX", "flat").strip().lower(),
+        hnsw_ef_search=int(os.getenv("HNSW_EF_SEARCH", "64")),
         embeddings_provider=os.getenv("EMBEDDINGS_PROVIDER", "fake").lower(),
         embeddings_model=os.getenv(
             "EMBEDDINGS_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
@@ -46,4 +55,7 @@ def get_settings() -> Settings:
         azure_openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
         eval_output_dir=os.getenv("EVAL_OUTPUT_DIR", "eval/results"),
         admin_api_token=os.getenv("ADMIN_API_TOKEN"),
+        max_message_chars=int(os.getenv("MAX_MESSAGE_CHARS", "2000")),
+        max_rag_context_chars=int(os.getenv("MAX_RAG_CONTEXT_CHARS", "6000")),
+        rag_include_sources=os.getenv("RAG_INCLUDE_SOURCES", "false").strip().lower() == "true",
     )
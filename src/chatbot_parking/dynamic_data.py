@@ -1,8 +1,11 @@
 """Dynamic data access for availability, hours, and pricing."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
 
 DEFAULT_WORKING_HOURS = os.getenv("PARKING_WORKING_HOURS", "Mon-Sun 06:00-23:00")
@@ -13,12 +16,29 @@ DEFAULT_DB_PATH = Path.cwd() / "data" / "parking.db"
 FALLBACK_DB_PATH = Path(__file__).resolve().parents[2] / "data" / "parking.db"
 TMP_DB_PATH = Path("/tmp/parking.db")
 
+# Availability changes slowly; bursts of turns within this window reuse one read. 0 disables.
+DYNAMIC_INFO_TTL_SECONDS = float(os.getenv("PARKING_DYNAMIC_INFO_TTL", "5"))
+SQLITE_MMAP_BYTES = 64 * 1024 * 1024
+STATUS_QUERY = "SELECT working_hours, pricing, available_spaces FROM parking_status LIMIT 1"
+
+_INIT_LOCK = threading.Lock()
+_INITIALIZED: set[Path] = set()
+# Per-thread reader connections; sqlite3 reuses the prepared STATUS_QUERY on each one.
+_LOCAL = threading.local()
+_CACHE: dict[Path, tuple[float, "DynamicInfo"]] = {}
+
 
 def _get_db_path() -> Path:
     env = os.getenv("PARKING_DB_PATH")
     if env:
         return Path(env)
+    return _default_db_path()
 
+
+@lru_cache(maxsize=1)
+def _default_db_path() -> Path:
+    # The exists()/access() probes below resolve the same way for the life of the
+    # process, so run them once rather than on every chat turn.
     candidates = [Path("/app/data/parking.db"), DEFAULT_DB_PATH, FALLBACK_DB_PATH]
     for candidate in candidates:
         if candidate.exists():
@@ -37,11 +57,20 @@ def _get_db_path() -> Path:
     return TMP_DB_PATH
 
 
-@dataclass
+@dataclass(slots=True)
 class DynamicInfo:
     working_hours: str
     pricing: str
     available_spaces: int
+    # Prompt line for the LLM; built once per instance, so a cached instance gives
+    # byte-identical prompts across turns (helps provider-side prefix caching).
+    formatted: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.formatted = (
+            f"Current availability: {self.available_spaces} spaces. "
+            f"Hours: {self.working_hours}. Pricing: {self.pricing}."
+        )
 
 
 def _connect(db_path: Path) -> sqlite3.Connection:
@@ -79,17 +108,66 @@ def initialize_db() -> None:
             connection.commit()
 
 
+def _ensure_initialized(db_path: Path) -> None:
+    if db_path in _INITIALIZED:
+        return
+    with _INIT_LOCK:
+        if db_path not in _INITIALIZED:
+            initialize_db()
+            _INITIALIZED.add(db_path)
+
+
+def _reader(db_path: Path) -> sqlite3.Connection:
+    connections = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+    connection = connections.get(db_path)
+    if connection is None:
+        connection = _connect(db_path)
+        try:
+            connection.execute("PRAGMA query_only = 1")
+            # Read pages straight from the OS page cache instead of copying them into SQLite's pager.
+            connection.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_BYTES}")
+        except sqlite3.Error:
+            connection.close()
+            raise
+        connections[db_path] = connection
+    return connection
+
+
+def _read_status(db_path: Path) -> DynamicInfo:
+    try:
+        row = _reader(db_path).execute(STATUS_QUERY).fetchone()
+    except sqlite3.Error:
+        # Drop the cached connection (file replaced, schema missing) so the next call reopens it,
+        # and forget the seeding so a database deleted at runtime is recreated.
+        connection = getattr(_LOCAL, "connections", {}).pop(db_path, None)
+        if connection is not None:
+            connection.close()
+        with _INIT_LOCK:
+            _INITIALIZED.discard(db_path)
+        raise
+    if not row:
+        return DynamicInfo(DEFAULT_WORKING_HOURS, DEFAULT_PRICING, DEFAULT_AVAILABLE_SPACES)
+    return DynamicInfo(row[0], row[1], row[2])
+
+
+def clear_dynamic_info_cache() -> None:
+    _CACHE.clear()
+
+
 def get_dynamic_info() -> DynamicInfo:
     try:
-        initialize_db()
         db_path = _get_db_path()
-        with _connect(db_path) as connection:
-            row = connection.execute(
-                "SELECT working_hours, pricing, available_spaces FROM parking_status LIMIT 1"
-            ).fetchone()
-            if not row:
-                return DynamicInfo(DEFAULT_WORKING_HOURS, DEFAULT_PRICING, DEFAULT_AVAILABLE_SPACES)
-            return DynamicInfo(row[0], row[1], row[2])
+        now = time.monotonic()
+        cached = _CACHE.get(db_path)
+        if cached and cached[0] > now:
+            return cached[1]
+        _ensure_initialized(db_path)
+        info = _read_status(db_path)
+        if DYNAMIC_INFO_TTL_SECONDS > 0:
+            _CACHE[db_path] = (now + DYNAMIC_INFO_TTL_SECONDS, info)
+        return info
     except Exception:
         # Never fail the chat flow because dynamic data is unavailable.
         return DynamicInfo(DEFAULT_WORKING_HOURS, DEFAULT_PRICING, DEFAULT_AVAILABLE_SPACES)
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import json
+import os
 import statistics
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
 from chatbot_parking.config import get_settings
-from chatbot_parking.rag import build_vector_store, retrieve
+from chatbot_parking.rag import RetrievalResult, build_vector_store, retrieve
 
 DATASET_PATH = Path("eval/qa_dataset.json")
 REPORT_PATH = Path("docs/evaluation_report.md")
@@ -21,19 +25,29 @@ def load_dataset() -> list[dict]:
     return json.loads(DATASET_PATH.read_text(encoding="utf-8"))
 
 
+def _time_retrieve(question: str, store, k: int) -> tuple[RetrievalResult, float]:
+    start = time.perf_counter()
+    result = retrieve(question, store, k=k)
+    return result, time.perf_counter() - start
+
+
 def evaluate(k: int = 3) -> dict:
     store = build_vector_store(insert_documents=False)
     dataset = load_dataset()
 
     recalls: list[float] = []
     precisions: list[float] = []
-    latencies: list[float] = []
 
-    for sample in dataset:
-        start = time.perf_counter()
-        result = retrieve(sample["question"], store, k=k)
-        latencies.append(time.perf_counter() - start)
+    # Retrieval is I/O-bound (embedding API, vector store), so questions are fetched
+    # concurrently; each one is timed on its own so the percentiles stay per query.
+    concurrency = max(1, int(os.getenv("EVAL_CONCURRENCY", "16")))
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timed = list(pool.map(lambda sample: _time_retrieve(sample["question"], store, k), dataset))
+
+    results = [result for result, _ in timed]
+    latencies = [elapsed for _, elapsed in timed]
 
+    for sample, result in zip(dataset, results):
         retrieved_ids = {doc.metadata.get("source_id", doc.metadata.get("id")) for doc in result.documents}
         expected_ids = set(sample["expected_ids"])
         if not expected_ids:
@@ -46,8 +60,8 @@ def evaluate(k: int = 3) -> dict:
     return {
         "recall_at_k": statistics.mean(recalls) if recalls else 0.0,
         "precision_at_k": statistics.mean(precisions) if precisions else 0.0,
-        "latency_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
-        "latency_p95_ms": statistics.quantiles(latencies, n=20)[18] * 1000 if len(latencies) >= 20 else 0.0,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) * 1000 if latencies else 0.0,
+        "latency_p95_ms": float(np.percentile(latencies, 95)) * 1000 if latencies else 0.0,
     }
 
 
@@ -8,11 +8,24 @@ These are intentionally lightweight heuristics, meant as a defense-in-depth laye
 in addition to strict prompting, input validation, and least-privilege tool use.
 """
 
+import logging
 import os
 import re
-from typing import Iterable
+import shutil
+import tempfile
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Literal, Sequence
 from functools import lru_cache
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; the `re` patterns below are authoritative.
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
 SENSITIVE_PATTERNS: list[re.Pattern[str]] = [
     re.compile(r"\b\d{16}\b"),  # credit card like sequences
     re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),  # SSN-like
@@ -48,15 +61,183 @@ SYSTEM_PROMPT_REQUEST_PATTERNS: list[re.Pattern[str]] = [
     re.compile(r"\bwhat\b.*\b(system|developer)\b.*\b(prompt|message|instructions)\b", re.IGNORECASE),
 ]
 
+PROMPT_INJECTION_SCAN_CHARS = 4000
+
+# Joins documents for batch scanning. No pattern can match across it: `.` stops
+# at newlines and no character class above accepts "\x00".
+_DOCUMENT_SEPARATOR = "\n\x00\n"
+
+
+def _compile_union(patterns: Sequence[re.Pattern[str]]) -> re.Pattern[str]:
+    parts = []
+    for pattern in patterns:
+        scope = "?i:" if pattern.flags & re.IGNORECASE else "?:"
+        parts.append(f"({scope}{pattern.pattern})")
+    return re.compile("|".join(parts))
+
+
+_SENSITIVE_UNION = _compile_union(SENSITIVE_PATTERNS)
+_PROMPT_INJECTION_UNION = _compile_union(PROMPT_INJECTION_PATTERNS)
+_SYSTEM_PROMPT_REQUEST_UNION = _compile_union(SYSTEM_PROMPT_REQUEST_PATTERNS)
+# Screens user input for both checks in one pass; see classify_guard.
+_USER_GUARD_UNION = _compile_union([*SYSTEM_PROMPT_REQUEST_PATTERNS, *PROMPT_INJECTION_PATTERNS])
+
+# Pattern ids returned by scan() index into this list.
+GUARDRAIL_PATTERNS: list[re.Pattern[str]] = [*SENSITIVE_PATTERNS, *PROMPT_INJECTION_PATTERNS]
+SENSITIVE_PATTERN_IDS = frozenset(range(len(SENSITIVE_PATTERNS)))
+PROMPT_INJECTION_PATTERN_IDS = frozenset(range(len(SENSITIVE_PATTERNS), len(GUARDRAIL_PATTERNS)))
+
+
+def _compile_hyperscan(patterns: Sequence[re.Pattern[str]]):
+    if hyperscan is None:
+        return None
+    flags = [
+        hyperscan.HS_FLAG_SINGLEMATCH | (hyperscan.HS_FLAG_CASELESS if pattern.flags & re.IGNORECASE else 0)
+        for pattern in patterns
+    ]
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.pattern.encode("ascii") for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=flags,
+        )
+    except Exception:
+        return None
+    return database
+
+
+_HS_DATABASE = _compile_hyperscan(GUARDRAIL_PATTERNS)
+_HS_LOCAL = threading.local()
+
+
+def _hyperscan_hits(text: str) -> set[int]:
+    # Scratch space is per thread; a database can be shared.
+    scratch = getattr(_HS_LOCAL, "scratch", None)
+    if scratch is None:
+        scratch = _HS_LOCAL.scratch = hyperscan.Scratch(_HS_DATABASE)
+    hits: set[int] = set()
+
+    def on_match(pattern_id, _start, _end, _flags, _context):
+        hits.add(pattern_id)
+        return 0
+
+    _HS_DATABASE.scan(text.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+    return hits
+
+
+def _hyperscan_any(text: str, pattern_ids: frozenset[int]) -> bool:
+    """True when any of pattern_ids matches; stops scanning at the first such hit."""
+    scratch = getattr(_HS_LOCAL, "scratch", None)
+    if scratch is None:
+        scratch = _HS_LOCAL.scratch = hyperscan.Scratch(_HS_DATABASE)
+
+    def on_match(pattern_id, _start, _end, _flags, _context):
+        return pattern_id in pattern_ids
+
+    try:
+        _HS_DATABASE.scan(text.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+
+def _matches_any(text: str, union: re.Pattern[str], pattern_ids: frozenset[int]) -> bool:
+    # Same ASCII-only caveat as scan(); `re` remains the fallback and the reference.
+    if _HS_DATABASE is not None and text.isascii():
+        return _hyperscan_any(text, pattern_ids)
+    return union.search(text) is not None
+
+
+def scan(text: str) -> set[int]:
+    """Return ids of GUARDRAIL_PATTERNS that match text, in a single pass when Hyperscan is available."""
+    text = text or ""
+    # Hyperscan's \b/\w/\d are ASCII-only, so it only agrees with `re` on ASCII input.
+    if _HS_DATABASE is not None and text.isascii():
+        return _hyperscan_hits(text)
+    return {pattern_id for pattern_id, pattern in enumerate(GUARDRAIL_PATTERNS) if pattern.search(text)}
+
+
+@dataclass(frozen=True)
+class DocumentScan:
+    sensitive: bool
+    prompt_injection: bool
+
 
 def contains_prompt_injection(text: str) -> bool:
-    sample = (text or "")[:4000]
-    return any(pattern.search(sample) for pattern in PROMPT_INJECTION_PATTERNS)
+    sample = (text or "")[:PROMPT_INJECTION_SCAN_CHARS]
+    return _matches_any(sample, _PROMPT_INJECTION_UNION, PROMPT_INJECTION_PATTERN_IDS)
 
 
 def is_system_prompt_request(text: str) -> bool:
     sample = (text or "")[:2000]
-    return any(pattern.search(sample) for pattern in SYSTEM_PROMPT_REQUEST_PATTERNS)
+    return _SYSTEM_PROMPT_REQUEST_UNION.search(sample) is not None
+
+
+def classify_guard(text: str) -> Literal["system_prompt", "prompt_injection"] | None:
+    """Combine is_system_prompt_request and contains_prompt_injection, system prompt first.
+
+    Clean input (the common case) costs one scan of the combined pattern; only a hit
+    re-runs the individual checks to pick the verdict with the original precedence.
+    """
+    if not _USER_GUARD_UNION.search((text or "")[:PROMPT_INJECTION_SCAN_CHARS]):
+        return None
+    if is_system_prompt_request(text):
+        return "system_prompt"
+    if contains_prompt_injection(text):
+        return "prompt_injection"
+    return None
+
+
+NER_BATCH_SIZE = 32
+
+
+def _ner_device() -> int:
+    # First CUDA device when torch sees one, otherwise CPU (-1).
+    try:
+        import torch
+
+        return 0 if torch.cuda.is_available() else -1
+    except Exception:
+        return -1
+
+
+def _load_quantized_ner_pipeline(model_name: str):
+    """NER pipeline on an int8 dynamically quantized ONNX export (needs optimum[onnxruntime])."""
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer, pipeline
+
+    base_dir = os.getenv("GUARDRAILS_QUANTIZED_DIR") or os.path.join(tempfile.gettempdir(), "guardrails-ner-int8")
+    save_dir = os.path.join(base_dir, model_name.replace("/", "--"))
+    if not os.path.exists(os.path.join(save_dir, "model_quantized.onnx")):
+        # One-off export + quantization into a private directory, then an atomic rename,
+        # so workers starting together never load a half-written model.
+        os.makedirs(base_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=".export-", dir=base_dir)
+        try:
+            quantizer = ORTQuantizer.from_pretrained(
+                ORTModelForTokenClassification.from_pretrained(model_name, export=True)
+            )
+            quantizer.quantize(
+                save_dir=staging_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            try:
+                os.replace(staging_dir, save_dir)
+            except OSError:
+                if not os.path.exists(os.path.join(save_dir, "model_quantized.onnx")):
+                    raise
+                # Another worker finished first; use its export.
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return pipeline(
+        "token-classification",
+        model=ORTModelForTokenClassification.from_pretrained(save_dir, file_name="model_quantized.onnx"),
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        aggregation_strategy="simple",
+    )
 
 
 @lru_cache(maxsize=1)
@@ -65,20 +246,39 @@ def _load_ner_pipeline():
     default_enabled = "false" if app_env == "prod" else "true"
     if os.getenv("GUARDRAILS_USE_ML", default_enabled).lower() != "true":
         return None
+    model_name = os.getenv("GUARDRAILS_NER_MODEL", "dslim/bert-base-NER")
+    if os.getenv("GUARDRAILS_QUANTIZE", "false").strip().lower() == "true":
+        try:
+            return _load_quantized_ner_pipeline(model_name)
+        except Exception:
+            logger.warning(
+                "GUARDRAILS_QUANTIZE=true but the int8 NER model could not be loaded; using the regular model",
+                exc_info=True,
+            )
     try:
         from transformers import pipeline
 
-        model_name = os.getenv("GUARDRAILS_NER_MODEL", "dslim/bert-base-NER")
         return pipeline(
             "token-classification",
             model=model_name,
             aggregation_strategy="simple",
+            device=_ner_device(),
         )
     except Exception:
         return None
 
 
+_SENSITIVE_ENTITY_GROUPS = frozenset({"PER", "PERSON", "EMAIL", "PHONE"})
+
+
+# PER/EMAIL/PHONE entities need a capitalised word, an "@" or a digit run; text with
+# none of them cannot produce a sensitive entity, so it skips the model.
+_NER_TRIGGER = re.compile(r"[A-ZА-ЯЁІЇЄҐ]\w{2,}|@|\d{3,}")
+
+
 def _contains_sensitive_via_ml(text: str) -> bool:
+    if not _NER_TRIGGER.search(text):
+        return False
     ner = _load_ner_pipeline()
     if ner is None:
         return False
@@ -87,31 +287,124 @@ def _contains_sensitive_via_ml(text: str) -> bool:
     except Exception:
         return False
 
-    sensitive_groups = {"PER", "PERSON", "EMAIL", "PHONE"}
-    return any(entity.get("entity_group") in sensitive_groups for entity in entities)
+    return any(entity.get("entity_group") in _SENSITIVE_ENTITY_GROUPS for entity in entities)
+
+
+def _sensitive_via_ml_batch(texts: Sequence[str]) -> list[bool]:
+    """Batch variant of _contains_sensitive_via_ml: one pipeline call for all texts."""
+    flags = [False] * len(texts)
+    candidates = [index for index, text in enumerate(texts) if _NER_TRIGGER.search(text)]
+    ner = _load_ner_pipeline() if candidates else None
+    if ner is None:
+        return flags
+    try:
+        results = ner([texts[index][:1000] for index in candidates], batch_size=NER_BATCH_SIZE)
+    except Exception:
+        return flags
+    if len(results) != len(candidates):
+        return flags
+    for index, entities in zip(candidates, results):
+        flags[index] = any(entity.get("entity_group") in _SENSITIVE_ENTITY_GROUPS for entity in entities)
+    return flags
 
 
 def contains_sensitive_data(text: str) -> bool:
-    if any(pattern.search(text) for pattern in SENSITIVE_PATTERNS):
+    if _matches_any(text, _SENSITIVE_UNION, SENSITIVE_PATTERN_IDS):
         return True
     return _contains_sensitive_via_ml(text)
 
 
+# Retrieved chunks repeat across queries, so remember the regex verdict per chunk text.
+@lru_cache(maxsize=4096)
+def _chunk_matches_sensitive_pattern(chunk: str) -> bool:
+    return _matches_any(chunk, _SENSITIVE_UNION, SENSITIVE_PATTERN_IDS)
+
+
+def _flag_documents(pattern: re.Pattern[str], texts: Sequence[str]) -> list[bool]:
+    """Search all texts in one pass over a joined buffer; return a per-text hit flag."""
+    flags = [False] * len(texts)
+    if not texts:
+        return flags
+
+    starts: list[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(_DOCUMENT_SEPARATOR)
+    buffer = _DOCUMENT_SEPARATOR.join(texts)
+
+    pos = 0
+    while (match := pattern.search(buffer, pos)) is not None:
+        index = bisect_right(starts, match.start()) - 1
+        flags[index] = True
+        if index + 1 >= len(texts):
+            break
+        # One hit is enough for a document; resume at the next one.
+        pos = starts[index + 1]
+    return flags
+
+
+def _scan_document(text: str) -> DocumentScan:
+    hits = scan(text)
+    if len(text) > PROMPT_INJECTION_SCAN_CHARS:
+        injection_hits = scan(text[:PROMPT_INJECTION_SCAN_CHARS]) & PROMPT_INJECTION_PATTERN_IDS
+    else:
+        injection_hits = hits & PROMPT_INJECTION_PATTERN_IDS
+    return DocumentScan(
+        sensitive=bool(hits & SENSITIVE_PATTERN_IDS) or _contains_sensitive_via_ml(text),
+        prompt_injection=bool(injection_hits),
+    )
+
+
+def scan_documents(texts: Sequence[str]) -> list[DocumentScan]:
+    """Batch variant of contains_sensitive_data/contains_prompt_injection."""
+    texts = [text or "" for text in texts]
+    if _HS_DATABASE is not None:
+        return [_scan_document(text) for text in texts]
+    sensitive = _flag_documents(_SENSITIVE_UNION, texts)
+    injection = _flag_documents(
+        _PROMPT_INJECTION_UNION,
+        [text[:PROMPT_INJECTION_SCAN_CHARS] for text in texts],
+    )
+    # Only texts the regexes passed need the (batched) NER check.
+    unflagged = [index for index, is_sensitive in enumerate(sensitive) if not is_sensitive]
+    for index, flagged in zip(unflagged, _sensitive_via_ml_batch([texts[index] for index in unflagged])):
+        sensitive[index] = flagged
+    return [
+        DocumentScan(sensitive=is_sensitive, prompt_injection=is_injection)
+        for is_sensitive, is_injection in zip(sensitive, injection)
+    ]
+
+
 def filter_sensitive(chunks: Iterable[str]) -> list[str]:
-    return [chunk for chunk in chunks if not contains_sensitive_data(chunk)]
+    candidates = [chunk for chunk in chunks if not _chunk_matches_sensitive_pattern(chunk)]
+    return [chunk for chunk, flagged in zip(candidates, _sensitive_via_ml_batch(candidates)) if not flagged]
 
 
 def filter_prompt_injection(chunks: Iterable[str]) -> list[str]:
     return [chunk for chunk in chunks if not contains_prompt_injection(chunk)]
 
 
-def redact_sensitive(text: str) -> str:
+def redact_sensitive_with_count(text: str) -> tuple[str, int]:
+    """Redact like redact_sensitive and also return how many redactions were made."""
     redacted = text
-    for pattern in SENSITIVE_PATTERNS:
-        redacted = pattern.sub("[REDACTED]", redacted)
-    if _contains_sensitive_via_ml(redacted):
-        return "[REDACTED]"
-    return redacted
+    count = 0
+    # Substitution stays per pattern (later patterns see earlier redactions); clean
+    # text, the common case, is ruled out by one union scan first.
+    patterns = SENSITIVE_PATTERNS if _matches_any(text, _SENSITIVE_UNION, SENSITIVE_PATTERN_IDS) else ()
+    for pattern in patterns:
+        redacted, replaced = pattern.subn("[REDACTED]", redacted)
+        count += replaced
+    # NER only needs the text the regexes left alone; the placeholder itself would
+    # otherwise trip _NER_TRIGGER and force a model pass on every redacted string.
+    residual = redacted.replace("[REDACTED]", " ") if count else redacted
+    if _contains_sensitive_via_ml(residual):
+        return "[REDACTED]", count + 1
+    return redacted, count
+
+
+def redact_sensitive(text: str) -> str:
+    return redact_sensitive_with_count(text)[0]
 
 
 def safe_output(text: str) -> str:
@@ -122,3 +415,78 @@ def safe_output(text: str) -> str:
         trimmed = text[:max_chars].rstrip()
         return trimmed + ("..." if trimmed else "")
     return text
+
+
+# Cut only where sentence punctuation is followed by whitespace already in the buffer.
+# No sensitive pattern spans "[.!?]<space>", and a bare newline is not a cut because
+# phone numbers may be split by one.
+_SENTENCE_END_RE = re.compile(r"[.!?]\s")
+# Text buffered past a cut before the sentence is released; a match that starts in the
+# sentence is searched for in it too, so one straddling the cut is seen whole.
+STREAM_LOOKAHEAD_CHARS = 128
+
+
+def _sensitive_match_starts_before(text: str, end: int) -> bool:
+    # The leftmost match per pattern is enough: any later one starts later still.
+    for pattern in SENSITIVE_PATTERNS:
+        match = pattern.search(text)
+        if match is not None and match.start() < end:
+            return True
+    return False
+
+
+async def safe_output_stream(
+    pieces: AsyncIterable[str],
+    on_stop: Callable[[], None] | None = None,
+) -> AsyncIterator[str]:
+    """Streaming safe_output: re-chunk into sentences and check each before emitting it.
+
+    Already-emitted sentences cannot be withdrawn, so a sensitive sentence ends the
+    stream with the refusal text instead of replacing the whole answer. `on_stop` is
+    called when the stream ends that way or is truncated at MAX_RESPONSE_CHARS.
+    """
+    max_chars = int(os.getenv("MAX_RESPONSE_CHARS", "4000"))
+    emitted = 0
+    buffer = ""
+
+    def check(segment: str, window: str) -> tuple[str, bool]:
+        nonlocal emitted
+        if contains_sensitive_data(segment) or _sensitive_match_starts_before(window, len(segment)):
+            stopped()
+            return ("\n" if emitted else "") + "Sorry, I cannot share private information.", True
+        if max_chars > 0 and emitted + len(segment) > max_chars:
+            trimmed = segment[: max_chars - emitted].rstrip()
+            stopped()
+            return trimmed + "...", True
+        emitted += len(segment)
+        return segment, False
+
+    def stopped() -> None:
+        if on_stop is not None:
+            on_stop()
+
+    def release(limit: int) -> list[tuple[str, bool]]:
+        nonlocal buffer
+        released: list[tuple[str, bool]] = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(buffer, 0, limit):
+            end = match.end()
+            released.append(check(buffer[start:end], buffer[start : end + STREAM_LOOKAHEAD_CHARS]))
+            start = end
+            if released[-1][1]:
+                break
+        buffer = buffer[start:]
+        return released
+
+    async for piece in pieces:
+        buffer += piece
+        for segment, done in release(max(len(buffer) - STREAM_LOOKAHEAD_CHARS, 0)):
+            yield segment
+            if done:
+                return
+    for segment, done in release(len(buffer)):
+        yield segment
+        if done:
+            return
+    if buffer:
+        yield check(buffer, buffer)[0]
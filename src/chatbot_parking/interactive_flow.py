@@ -9,6 +9,7 @@ from typing import Any, Callable
 
 from chatbot_parking.booking_utils import (
     BOOKING_FIELDS,
+    NEXT_BOOKING_FIELD,
     apply_valid_parsed_details,
     is_booking_keyword_intent,
     is_period_within_working_hours,
@@ -50,10 +51,7 @@ FIELD_LABELS: dict[str, str] = {
 
 
 def _next_field(current: str | None) -> str | None:
-    if current is None or current not in BOOKING_FIELDS:
-        return None
-    idx = BOOKING_FIELDS.index(current)
-    return BOOKING_FIELDS[idx + 1] if idx + 1 < len(BOOKING_FIELDS) else None
+    return NEXT_BOOKING_FIELD.get(current) if current is not None else None
 
 
 def _status_detail(status: str, collected: dict[str, Any]) -> str:
@@ -7,11 +7,11 @@ from typing import Literal, TypedDict
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, StateGraph
 
-from chatbot_parking.chatbot import ParkingChatbot
+from chatbot_parking.chatbot import get_chatbot
 from chatbot_parking.interactive_flow import run_chat_turn
 from chatbot_parking.persistence import IN_MEMORY_PERSISTENCE
 
-CHATBOT = ParkingChatbot()
+CHATBOT = get_chatbot()
 
 
 class InteractiveState(TypedDict, total=False):
@@ -5,10 +5,10 @@ from dataclasses import dataclass, field
 from langgraph.graph import END, StateGraph
 
 from chatbot_parking.admin_agent import AdminDecision, request_admin_approval_tool
-from chatbot_parking.chatbot import ConversationState, ParkingChatbot, ReservationRequest
+from chatbot_parking.chatbot import ConversationState, ReservationRequest, get_chatbot
 from chatbot_parking.mcp_client import record_reservation
 
-CHATBOT = ParkingChatbot()
+CHATBOT = get_chatbot()
 
 
 @dataclass
@@ -29,14 +29,7 @@ def request_admin_approval(reservation: ReservationRequest) -> AdminDecision:
     that monkeypatch this symbol directly.
     """
 
-    decision = request_admin_approval_tool.invoke(
-        {
-            "name": reservation.name,
-            "surname": reservation.surname,
-            "car_number": reservation.car_number,
-            "reservation_period": reservation.reservation_period,
-        }
-    )
+    decision = request_admin_approval_tool.invoke(reservation.to_payload())
     return AdminDecision(
         approved=decision["approved"],
         decided_at=decision["decided_at"],
@@ -2,18 +2,34 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from copy import deepcopy
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import lru_cache
 import os
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, TypeVar
 from uuid import uuid4
 
+T = TypeVar("T")
+
+THREAD_CACHE_MAXSIZE = 4096
+# In-memory approvals kept before the oldest decided ones are evicted; pending ones are never dropped.
+APPROVALS_MAXSIZE = 10_000
+# Read-modify-write attempts in CosmosPersistence.update_thread before a conflict is raised.
+THREAD_UPDATE_ATTEMPTS = 3
+
 
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+class ThreadUpdateConflict(RuntimeError):
+    """A thread was modified by another writer during update_thread."""
+
+
 @dataclass(frozen=True)
 class PersistenceSettings:
     backend: str
@@ -24,6 +40,7 @@ class PersistenceSettings:
     cosmos_threads_container: str
     cosmos_approvals_container: str
     cosmos_reservations_container: str
+    thread_cache_ttl_seconds: float = 0.0
 
 
 class Persistence:
@@ -33,7 +50,22 @@ class Persistence:
     def upsert_thread(self, thread_id: str, state: dict[str, Any]) -> None:
         raise NotImplementedError
 
-    def create_approval(self, payload: dict[str, Any]) -> str:
+    def update_thread(
+        self,
+        thread_id: str,
+        update: Callable[[dict[str, Any] | None], tuple[T, dict[str, Any]]],
+    ) -> T:
+        """Read a thread, pass its state to `update`, and store the state it returns.
+
+        Backends with optimistic concurrency re-run `update` on fresh state when another
+        writer wins, so `update` should not write anything itself: hand it a
+        DeferredWrites view and flush that after update_thread returns.
+        """
+        result, state = update(self.get_thread(thread_id))
+        self.upsert_thread(thread_id, state)
+        return result
+
+    def create_approval(self, payload: dict[str, Any], request_id: str | None = None) -> str:
         raise NotImplementedError
 
     def get_approval(self, request_id: str) -> dict[str, Any] | None:
@@ -76,6 +108,13 @@ class InMemoryPersistence(Persistence):
         self.threads: dict[str, dict[str, Any]] = {}
         self.approvals: dict[str, dict[str, Any]] = {}
         self.reservations: list[dict[str, Any]] = []
+        # Undecided request ids in creation order, so listing pending work does not
+        # scan every historical approval.
+        self._pending_ids: dict[str, None] = {}
+        # Decided request ids, least recently decided first; eviction order for APPROVALS_MAXSIZE.
+        self._decided_ids: OrderedDict[str, None] = OrderedDict()
+        # Request handlers run on a thread pool; keep approvals and the index consistent.
+        self._approvals_lock = threading.Lock()
 
     def get_thread(self, thread_id: str) -> dict[str, Any] | None:
         entry = self.threads.get(thread_id)
@@ -90,14 +129,19 @@ class InMemoryPersistence(Persistence):
             "updated_at": _utc_now(),
         }
 
-    def create_approval(self, payload: dict[str, Any]) -> str:
-        request_id = str(uuid4())
-        self.approvals[request_id] = {
-            "request_id": request_id,
-            "payload": payload,
-            "decision": None,
-            "created_at": _utc_now(),
-        }
+    def create_approval(self, payload: dict[str, Any], request_id: str | None = None) -> str:
+        request_id = request_id or str(uuid4())
+        with self._approvals_lock:
+            self.approvals[request_id] = {
+                "request_id": request_id,
+                "payload": payload,
+                "decision": None,
+                "created_at": _utc_now(),
+            }
+            self._pending_ids[request_id] = None
+            while len(self.approvals) > APPROVALS_MAXSIZE and self._decided_ids:
+                evicted_id, _ = self._decided_ids.popitem(last=False)
+                self.approvals.pop(evicted_id, None)
         return request_id
 
     def get_approval(self, request_id: str) -> dict[str, Any] | None:
@@ -107,10 +151,24 @@ class InMemoryPersistence(Persistence):
         return dict(item)
 
     def list_pending_approvals(self) -> list[dict[str, Any]]:
-        return [dict(item) for item in self.approvals.values() if not item.get("decision")]
+        pending = []
+        with self._approvals_lock:
+            for request_id in list(self._pending_ids):
+                item = self.approvals.get(request_id)
+                if not item or item.get("decision"):
+                    # Removed or decided outside set_approval_decision.
+                    del self._pending_ids[request_id]
+                    continue
+                pending.append(dict(item))
+        return pending
 
     def list_decided_approvals(self, approved: bool | None = None) -> list[dict[str, Any]]:
-        decided = [dict(item) for item in self.approvals.values() if item.get("decision")]
+        # Creation order, like list_pending_approvals. Pending approvals are few, so a
+        # scan costs about the same as the decided index and also sees records
+        # written into `approvals` directly.
+        with self._approvals_lock:
+            items = list(self.approvals.values())
+        decided = [dict(item) for item in items if item.get("decision")]
         if approved is None:
             return decided
         return [
@@ -125,16 +183,20 @@ class InMemoryPersistence(Persistence):
         approved: bool,
         notes: str | None = None,
     ) -> dict[str, Any] | None:
-        item = self.approvals.get(request_id)
-        if not item:
-            return None
-
-        decision = {
-            "approved": approved,
-            "decided_at": _utc_now(),
-            "notes": notes,
-        }
-        item["decision"] = decision
+        with self._approvals_lock:
+            item = self.approvals.get(request_id)
+            if not item:
+                return None
+
+            decision = {
+                "approved": approved,
+                "decided_at": _utc_now(),
+                "notes": notes,
+            }
+            item["decision"] = decision
+            self._pending_ids.pop(request_id, None)
+            self._decided_ids[request_id] = None
+            self._decided_ids.move_to_end(request_id)
         return dict(decision)
 
     def append_reservation(
@@ -197,12 +259,46 @@ class CosmosPersistence(Persistence):
         self._approvals = database.get_container_client(settings.cosmos_approvals_container)
         self._reservations = database.get_container_client(settings.cosmos_reservations_container)
 
+        # Short-lived read-through cache for hot threads (disabled when the TTL is 0).
+        # Only safe when one process owns a thread's writes for the TTL window.
+        self._thread_cache_ttl = settings.thread_cache_ttl_seconds
+        self._thread_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._thread_cache_lock = threading.Lock()
+
+    def _get_cached_thread(self, thread_id: str) -> dict[str, Any] | None:
+        if self._thread_cache_ttl <= 0:
+            return None
+        with self._thread_cache_lock:
+            entry = self._thread_cache.get(thread_id)
+            if entry is None:
+                return None
+            expires_at, state = entry
+            if time.monotonic() >= expires_at:
+                del self._thread_cache[thread_id]
+                return None
+            self._thread_cache.move_to_end(thread_id)
+            return deepcopy(state)
+
+    def _cache_thread(self, thread_id: str, state: dict[str, Any]) -> None:
+        if self._thread_cache_ttl <= 0:
+            return
+        with self._thread_cache_lock:
+            self._thread_cache[thread_id] = (time.monotonic() + self._thread_cache_ttl, deepcopy(state))
+            self._thread_cache.move_to_end(thread_id)
+            while len(self._thread_cache) > THREAD_CACHE_MAXSIZE:
+                self._thread_cache.popitem(last=False)
+
     def get_thread(self, thread_id: str) -> dict[str, Any] | None:
+        cached = self._get_cached_thread(thread_id)
+        if cached is not None:
+            return cached
         try:
             item = self._threads.read_item(item=thread_id, partition_key=thread_id)
-            return dict(item.get("state") or {})
         except Exception:
             return None
+        state = dict(item.get("state") or {})
+        self._cache_thread(thread_id, state)
+        return state
 
     def upsert_thread(self, thread_id: str, state: dict[str, Any]) -> None:
         self._threads.upsert_item(
@@ -213,9 +309,60 @@ class CosmosPersistence(Persistence):
                 "updated_at": _utc_now(),
             }
         )
+        self._cache_thread(thread_id, state)
 
-    def create_approval(self, payload: dict[str, Any]) -> str:
-        request_id = str(uuid4())
+    def update_thread(
+        self,
+        thread_id: str,
+        update: Callable[[dict[str, Any] | None], tuple[T, dict[str, Any]]],
+    ) -> T:
+        # Conditional write on the ETag that was read, so a concurrent turn on the
+        # same thread is never silently overwritten; the turn is re-run on fresh state.
+        from azure.core import MatchConditions
+        from azure.cosmos import exceptions
+
+        attempt = 1
+        while True:
+            last_attempt = attempt >= THREAD_UPDATE_ATTEMPTS
+            attempt += 1
+            try:
+                item = self._threads.read_item(item=thread_id, partition_key=thread_id)
+            except exceptions.CosmosResourceNotFoundError:
+                item = None
+            except Exception:
+                # Transient read failure: read again, but never run the turn on made-up state.
+                if last_attempt:
+                    raise
+                continue
+
+            result, state = update(dict(item.get("state") or {}) if item else None)
+            body = {
+                "id": thread_id,
+                "thread_id": thread_id,
+                "state": dict(state),
+                "updated_at": _utc_now(),
+            }
+            try:
+                if item is None:
+                    self._threads.create_item(body)
+                else:
+                    self._threads.replace_item(
+                        item=thread_id,
+                        body=body,
+                        etag=item.get("_etag"),
+                        match_condition=MatchConditions.IfNotModified,
+                    )
+            except (exceptions.CosmosAccessConditionFailedError, exceptions.CosmosResourceExistsError) as exc:
+                with self._thread_cache_lock:
+                    self._thread_cache.pop(thread_id, None)
+                if last_attempt:
+                    raise ThreadUpdateConflict(f"Thread {thread_id} was updated concurrently") from exc
+                continue
+            self._cache_thread(thread_id, state)
+            return result
+
+    def create_approval(self, payload: dict[str, Any], request_id: str | None = None) -> str:
+        request_id = request_id or str(uuid4())
         self._approvals.upsert_item(
             {
                 "id": request_id,
@@ -311,8 +458,10 @@ class CosmosPersistence(Persistence):
         start_at: str | None = None,
         end_at: str | None = None,
     ) -> dict[str, Any]:
-        entry_id = str(uuid4())
-        partition_key = request_id or entry_id
+        # Keyed by request_id so a re-run chat turn (see update_thread) overwrites
+        # its reservation instead of recording it twice.
+        entry_id = request_id or str(uuid4())
+        partition_key = entry_id
         payload = {
             "id": entry_id,
             "request_id": request_id,
@@ -355,6 +504,36 @@ class CosmosPersistence(Persistence):
         return results
 
 
+class DeferredWrites:
+    """Persistence view that queues approval and reservation writes until flush().
+
+    Reads go straight through. Used inside update_thread callbacks, which may run
+    more than once: only the attempt whose thread state was stored gets flushed.
+    """
+
+    def __init__(self, persistence: Persistence) -> None:
+        self._persistence = persistence
+        self._writes: list[Callable[[], object]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._persistence, name)
+
+    def create_approval(self, payload: dict[str, Any], request_id: str | None = None) -> str:
+        # The id is fixed now so the stored thread state can refer to it before the write.
+        request_id = request_id or str(uuid4())
+        self._writes.append(lambda: self._persistence.create_approval(payload, request_id=request_id))
+        return request_id
+
+    def append_reservation(self, **kwargs: Any) -> dict[str, Any]:
+        self._writes.append(lambda: self._persistence.append_reservation(**kwargs))
+        return dict(kwargs)
+
+    def flush(self) -> None:
+        writes, self._writes = self._writes, []
+        for write in writes:
+            write()
+
+
 @lru_cache(maxsize=1)
 def get_persistence_settings() -> PersistenceSettings:
     return PersistenceSettings(
@@ -369,6 +548,7 @@ def get_persistence_settings() -> PersistenceSettings:
         cosmos_reservations_container=os.getenv(
             "COSMOS_DB_CONTAINER_RESERVATIONS", "reservations"
         ),
+        thread_cache_ttl_seconds=float(os.getenv("COSMOS_THREAD_CACHE_TTL", "0")),
     )
 
 
@@ -1,9 +1,11 @@
 """Retrieval-augmented generation helpers."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 from urllib.parse import urlparse
-from typing import List
+from typing import AsyncIterator, List, Sequence
+from uuid import uuid4
 
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
@@ -17,12 +19,18 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter, TokenTextSp
 from chatbot_parking.config import get_settings
 from chatbot_parking.guardrails import (
     contains_prompt_injection,
-    contains_sensitive_data,
     redact_sensitive,
+    scan_documents,
 )
 from chatbot_parking.static_docs import STATIC_DOCUMENTS
 
 
+EMBED_BATCH_SIZE = 128
+QUERY_EMBED_CACHE_SIZE = 1024
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+
+
 @dataclass
 class RetrievalResult:
     documents: List[Document]
@@ -48,19 +56,27 @@ def _prepare_documents(
     chunk_size: int = 300,
     chunk_overlap: int = 40,
     splitter_type: str = "recursive",
+    ids: Sequence[str] | None = None,
+    texts: Sequence[str] | None = None,
+    sensitivity: Sequence[str] | None = None,
 ) -> list[Document]:
+    """Chunk source documents; pass ids/texts/sensitivity to reuse an earlier guardrail pass."""
     splitter = _build_splitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         splitter_type=splitter_type,
     )
-    chunked_documents: list[Document] = []
-
-    for doc in STATIC_DOCUMENTS:
-        source_id = doc["id"]
-        redacted = redact_sensitive(doc["text"])
-        sensitivity = "private" if contains_sensitive_data(doc["text"]) else "public"
+    if texts is None:
+        ids = [doc["id"] for doc in STATIC_DOCUMENTS]
+        raw_texts = [doc["text"] for doc in STATIC_DOCUMENTS]
+        scans = scan_documents(raw_texts)
+        texts = [redact_sensitive(text) if scan.sensitive else text for text, scan in zip(raw_texts, scans)]
+        sensitivity = ["private" if scan.sensitive else "public" for scan in scans]
+    elif ids is None or sensitivity is None:
+        raise ValueError("ids and sensitivity are required when texts are provided")
 
+    chunked_documents: list[Document] = []
+    for source_id, redacted, source_sensitivity in zip(ids, texts, sensitivity):
         for chunk_index, chunk_text in enumerate(splitter.split_text(redacted)):
             chunked_documents.append(
                 Document(
@@ -70,7 +86,7 @@ def _prepare_documents(
                         "source_id": source_id,
                         "chunk_id": f"{source_id}#chunk{chunk_index}",
                         "chunk_index": chunk_index,
-                        "sensitivity": sensitivity,
+                        "sensitivity": source_sensitivity,
                     },
                 )
             )
@@ -93,20 +109,50 @@ def _build_embeddings() -> Embeddings:
     raise ValueError(f"Unsupported embeddings provider: {settings.embeddings_provider}")
 
 
+class CachedQueryEmbeddings(Embeddings):
+    """Memoise embed_query per exact text; document embedding passes straight through."""
+
+    def __init__(self, inner: Embeddings, maxsize: int = QUERY_EMBED_CACHE_SIZE) -> None:
+        self.inner = inner
+        self._embed_query = lru_cache(maxsize=maxsize)(self._embed_query_uncached)
+
+    def _embed_query_uncached(self, text: str) -> tuple[float, ...]:
+        return tuple(self.inner.embed_query(text))
+
+    def embed_query(self, text: str) -> list[float]:
+        return list(self._embed_query(text))
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.inner.embed_documents(texts)
+
+    def cache_clear(self) -> None:
+        self._embed_query.cache_clear()
+
+
 def build_vector_store(
     embeddings: Embeddings | None = None,
     insert_documents: bool = True,
     chunk_size: int = 300,
     chunk_overlap: int = 40,
     splitter_type: str = "recursive",
+    ids: Sequence[str] | None = None,
+    texts: Sequence[str] | None = None,
+    sensitivity: Sequence[str] | None = None,
+    batch_size: int = EMBED_BATCH_SIZE,
 ):
     settings = get_settings()
     docs = _prepare_documents(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         splitter_type=splitter_type,
+        ids=ids,
+        texts=texts,
+        sensitivity=sensitivity,
     )
     embedder = embeddings or _build_embeddings()
+    if not isinstance(embedder, CachedQueryEmbeddings):
+        # Repeated questions skip the embedding call; each store gets its own cache.
+        embedder = CachedQueryEmbeddings(embedder)
 
     if settings.vector_backend == "weaviate":
         import weaviate
@@ -140,11 +186,86 @@ def build_vector_store(
             embedding=embedder,
         )
 
-    return FAISS.from_documents(docs, embedder)
+    # Embed all chunks in fixed-size batches instead of leaving batching to the provider.
+    chunk_texts = [doc.page_content for doc in docs]
+    vectors: list[list[float]] = []
+    for start in range(0, len(chunk_texts), batch_size):
+        vectors.extend(embedder.embed_documents(chunk_texts[start : start + batch_size]))
+    if settings.vector_quantization not in {"none", "int8"}:
+        raise ValueError(f"Unsupported vector quantization: {settings.vector_quantization}")
+    if settings.vector_index not in {"flat", "hnsw"}:
+        raise ValueError(f"Unsupported vector index: {settings.vector_index}")
+    if settings.vector_index == "hnsw" and vectors:
+        return _build_hnsw_faiss(
+            docs,
+            vectors,
+            embedder,
+            quantize=settings.vector_quantization == "int8",
+            ef_search=settings.hnsw_ef_search,
+        )
+    if settings.vector_quantization == "int8" and vectors:
+        return _build_int8_faiss(docs, vectors, embedder)
+    return FAISS.from_embeddings(
+        list(zip(chunk_texts, vectors)),
+        embedder,
+        metadatas=[doc.metadata for doc in docs],
+    )
+
+
+def _faiss_store(docs: list[Document], index, embedder: Embeddings) -> FAISS:
+    from langchain_community.docstore.in_memory import InMemoryDocstore
 
+    ids = [str(uuid4()) for _ in docs]
+    return FAISS(
+        embedding_function=embedder,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
 
-def retrieve(query: str, store, k: int = 3) -> RetrievalResult:
-    docs = store.similarity_search(query, k=k)
+
+def _build_int8_faiss(docs: list[Document], vectors: list[list[float]], embedder: Embeddings) -> FAISS:
+    """FAISS store with 8-bit scalar-quantized vectors (4x smaller than float32)."""
+    import faiss
+    import numpy as np
+
+    matrix = np.asarray(vectors, dtype="float32")
+    index = faiss.IndexScalarQuantizer(matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+    index.train(matrix)
+    index.add(matrix)
+    return _faiss_store(docs, index, embedder)
+
+
+def _build_hnsw_faiss(
+    docs: list[Document],
+    vectors: list[list[float]],
+    embedder: Embeddings,
+    *,
+    quantize: bool = False,
+    ef_search: int = 64,
+) -> FAISS:
+    """FAISS store over an HNSW graph: sub-linear search for corpora too large to scan."""
+    import faiss
+    import numpy as np
+
+    matrix = np.asarray(vectors, dtype="float32")
+    if quantize:
+        index = faiss.IndexHNSWSQ(matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+        index.train(matrix)
+    else:
+        index = faiss.IndexHNSWFlat(matrix.shape[1], HNSW_M)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = ef_search
+    index.add(matrix)
+    return _faiss_store(docs, index, embedder)
+
+
+def retrieve(query: str, store, k: int = 3, embedding: Sequence[float] | None = None) -> RetrievalResult:
+    # Reuse a query embedding the caller already computed instead of embedding again.
+    if embedding is not None:
+        docs = store.similarity_search_by_vector(list(embedding), k=k)
+    else:
+        docs = store.similarity_search(query, k=k)
     public_docs = [doc for doc in docs if doc.metadata.get("sensitivity") != "private"]
     public_docs = [doc for doc in public_docs if not contains_prompt_injection(doc.page_content)]
     return RetrievalResult(documents=public_docs)
@@ -328,7 +449,9 @@ def _echo_select_static_docs(question: str) -> list[str]:
     return deduped[:2]
 
 
+@lru_cache(maxsize=None)
 def _echo_doc_text(doc_id: str) -> str | None:
+    # Static docs never change at runtime, so each one is looked up and redacted once.
     for doc in STATIC_DOCUMENTS:
         if doc.get("id") == doc_id:
             text = (doc.get("text") or "").strip()
@@ -406,19 +529,38 @@ def generate_fallback_answer(question: str, dynamic_info: str) -> str:
     return _echo_generate_answer(question, context="", dynamic_info=dynamic_info)
 
 
-def generate_answer(question: str, context: str, dynamic_info: str) -> str:
-    settings = get_settings()
-    if settings.llm_provider == "echo":
-        return _echo_generate_answer(question, context, dynamic_info)
-
+def _answer_chain():
     prompt = ChatPromptTemplate.from_messages(
         [
             ("system", RAG_SYSTEM_PROMPT),
             ("human", RAG_HUMAN_PROMPT),
         ]
     )
-    chain = prompt | _build_llm() | StrOutputParser()
-    return chain.invoke({"question": question, "context": context, "dynamic": dynamic_info})
+    return prompt | _build_llm() | StrOutputParser()
+
+
+def generate_answer(question: str, context: str, dynamic_info: str) -> str:
+    settings = get_settings()
+    if settings.llm_provider == "echo":
+        return _echo_generate_answer(question, context, dynamic_info)
+
+    return _answer_chain().invoke({"question": question, "context": context, "dynamic": dynamic_info})
+
+
+async def generate_answer_stream(question: str, context: str, dynamic_info: str) -> AsyncIterator[str]:
+    """Streaming generate_answer: yields text pieces as the provider produces them."""
+    settings = get_settings()
+    if settings.llm_provider == "echo":
+        yield _echo_generate_answer(question, context, dynamic_info)
+        return
+
+    async for piece in _answer_chain().astream({"question": question, "context": context, "dynamic": dynamic_info}):
+        if piece:
+            yield piece
+
+
+# "booking" is already matched by "book", so it is not scanned separately.
+ECHO_BOOKING_KEYWORDS = ("book", "reserve", "reservation", "spot", "place")
 
 
 def classify_intent(question: str) -> str:
@@ -426,15 +568,7 @@ def classify_intent(question: str) -> str:
     settings = get_settings()
     if settings.llm_provider == "echo":
         lowered = question.lower()
-        booking_keywords = [
-            "book",
-            "booking",
-            "reserve",
-            "reservation",
-            "spot",
-            "place",
-        ]
-        return "booking" if any(word in lowered for word in booking_keywords) else "info"
+        return "booking" if any(word in lowered for word in ECHO_BOOKING_KEYWORDS) else "info"
 
     prompt = ChatPromptTemplate.from_messages(
         [
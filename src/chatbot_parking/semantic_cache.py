@@ -0,0 +1,90 @@
+"""In-memory semantic cache for RAG answers keyed by query embeddings."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """Return a cached answer when a new query embedding is close enough to a cached one.
+
+    Embeddings are stored L2-normalised in a preallocated float32 matrix, so a lookup
+    is one matrix-vector product. Entries expire after `ttl` seconds (answers embed
+    live availability) and the least recently used entry is evicted when full.
+    """
+
+    def __init__(self, maxsize: int, threshold: float = 0.92, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._matrix: np.ndarray | None = None
+        self._live = np.zeros(maxsize, dtype=bool)
+        # row -> (response, expires_at), ordered from least to most recently used.
+        self._entries: OrderedDict[int, tuple[str, float]] = OrderedDict()
+        self._free = list(range(maxsize - 1, -1, -1))
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]) -> np.ndarray | None:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        if array.ndim != 1 or not norm:
+            return None
+        return array / norm
+
+    def get(self, vector: Sequence[float]) -> str | None:
+        query = self._normalise(vector)
+        with self._lock:
+            if query is None or self._matrix is None or not self._entries:
+                return None
+            if query.shape[0] != self._matrix.shape[1]:
+                return None
+            scores = self._matrix @ query
+            scores[~self._live] = -np.inf
+            row = int(np.argmax(scores))
+            if scores[row] < self.threshold:
+                return None
+            response, expires_at = self._entries[row]
+            if time.monotonic() >= expires_at:
+                self._drop(row)
+                return None
+            self._entries.move_to_end(row)
+            return response
+
+    def put(self, vector: Sequence[float], response: str) -> None:
+        entry = self._normalise(vector)
+        if entry is None or self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != entry.shape[0]:
+                # First entry (or the embedder changed dimension): start over.
+                self._matrix = np.zeros((self.maxsize, entry.shape[0]), dtype=np.float32)
+                self._live[:] = False
+                self._entries.clear()
+                self._free = list(range(self.maxsize - 1, -1, -1))
+            if not self._free:
+                self._drop(next(iter(self._entries)))
+            row = self._free.pop()
+            self._matrix[row] = entry
+            self._live[row] = True
+            self._entries[row] = (response, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._live[:] = False
+            self._entries.clear()
+            self._free = list(range(self.maxsize - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, row: int) -> None:
+        del self._entries[row]
+        self._live[row] = False
+        self._free.append(row)
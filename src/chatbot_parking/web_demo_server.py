@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import hmac
 import hashlib
@@ -10,13 +12,15 @@ import os
 import tempfile
 import time
 from typing import Any, Optional
-from urllib import request
 from uuid import uuid4
 import json
 
 from fastapi import Depends, FastAPI, File, Header, HTTPException, Query, Request, UploadFile
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+import orjson
 from pydantic import BaseModel
+import requests
+from requests.adapters import HTTPAdapter
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
@@ -29,11 +33,13 @@ from chatbot_parking.http_security import apply_security_headers, enforce_rate_l
 from chatbot_parking.admin_store import (
     create_admin_request,
     get_admin_decision,
+    get_admin_decisions,
     get_admin_request,
     list_pending_requests,
     post_admin_decision,
+    wait_for_admin_decision,
 )
-from chatbot_parking.chatbot import ParkingChatbot
+from chatbot_parking.chatbot import get_chatbot
 from chatbot_parking.cli import is_reservation_intent
 from chatbot_parking.dynamic_data import get_dynamic_info
 from chatbot_parking.interactive_flow import run_chat_turn
@@ -41,7 +47,7 @@ from chatbot_parking.parking_spots import build_spot_board, default_board_window
 from chatbot_parking.persistence import get_persistence
 
 app = FastAPI(title="Parking Chat + Admin UI")
-chatbot = ParkingChatbot()
+chatbot = get_chatbot()
 
 def _app_env() -> str:
     return os.getenv("APP_ENV", "dev").strip().lower() or "dev"
@@ -146,6 +152,8 @@ def _resolve_ui_dir() -> Path:
 
 
 UI_DIR = _resolve_ui_dir()
+MAX_DECISION_BATCH = 100
+MAX_DECISION_WAIT_SECONDS = 60.0
 
 SESSION_SECRET = os.getenv("SESSION_SECRET_KEY")
 if not SESSION_SECRET:
@@ -258,33 +266,46 @@ def _enforce_thread_id_limits(thread_id: str) -> None:
         )
 
 
-def _build_admin_headers() -> dict[str, str]:
+@lru_cache(maxsize=4)
+def _durable_headers_for(function_key: str | None) -> dict[str, str]:
+    # Shared per key and treated as read-only by _post_json and _get_json.
     headers = {"Content-Type": "application/json"}
-    function_key = os.getenv("DURABLE_FUNCTION_KEY")
     if function_key:
         headers["x-functions-key"] = function_key
     return headers
 
 
+def _build_admin_headers() -> dict[str, str]:
+    return _durable_headers_for(os.getenv("DURABLE_FUNCTION_KEY"))
+
+
+@lru_cache(maxsize=1)
+def _get_http_session() -> requests.Session:
+    # Keep-alive pool for Durable calls, so status polls reuse one TCP/TLS connection.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def _post_json(url: str, payload: dict, headers: dict[str, str] | None = None) -> dict:
     merged_headers = dict(headers or {})
     merged_headers.setdefault("Content-Type", "application/json")
-    req = request.Request(
+    response = _get_http_session().post(
         url,
-        data=json.dumps(payload).encode("utf-8"),
+        data=orjson.dumps(payload),
         headers=merged_headers,
-        method="POST",
+        timeout=20,
     )
-    with request.urlopen(req, timeout=20) as response:
-        body = response.read().decode("utf-8")
-        return json.loads(body) if body else {}
+    response.raise_for_status()
+    return orjson.loads(response.content) if response.content else {}
 
 
 def _get_json(url: str, headers: dict[str, str] | None = None) -> dict:
-    req = request.Request(url, headers=headers or {}, method="GET")
-    with request.urlopen(req, timeout=20) as response:
-        body = response.read().decode("utf-8")
-        return json.loads(body) if body else {}
+    response = _get_http_session().get(url, headers=headers or {}, timeout=20)
+    response.raise_for_status()
+    return orjson.loads(response.content) if response.content else {}
 
 
 def _invoke_durable_chat(message: str, thread_id: str) -> dict:
@@ -292,8 +313,9 @@ def _invoke_durable_chat(message: str, thread_id: str) -> dict:
     if not base_url:
         raise RuntimeError("DURABLE_BASE_URL is not configured")
 
+    admin_headers = _build_admin_headers()
     start_url = f"{base_url}/api/chat/start"
-    starter = _post_json(start_url, {"message": message, "thread_id": thread_id}, headers=_build_admin_headers())
+    starter = _post_json(start_url, {"message": message, "thread_id": thread_id}, headers=admin_headers)
 
     status_url = starter.get("statusQueryGetUri")
     if not status_url:
@@ -303,14 +325,14 @@ def _invoke_durable_chat(message: str, thread_id: str) -> dict:
     # function key as an `x-functions-key` header can cause 403s on the runtime webhook.
     status_headers: dict[str, str] = {}
     if "code=" not in str(status_url):
-        status_headers = _build_admin_headers()
+        status_headers = admin_headers
 
     # Consumption plans can cold-start; default to a longer bound to avoid unnecessary fallback.
     timeout_seconds = float(os.getenv("DURABLE_POLL_TIMEOUT", "60"))
     poll_interval = float(os.getenv("DURABLE_POLL_INTERVAL", "1.0"))
-    deadline = time.time() + timeout_seconds
+    deadline = time.monotonic() + timeout_seconds
 
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         status = _get_json(status_url, headers=status_headers)
         runtime_status = status.get("runtimeStatus")
 
@@ -519,15 +541,21 @@ def speech_enabled() -> dict[str, Any]:
     return {"enabled": enabled, "provider": "openai" if enabled else None}
 
 
-def _transcribe_audio_openai(*, audio_bytes: bytes, filename: str, content_type: str | None) -> str:
+@lru_cache(maxsize=1)
+def _get_openai_client(api_key: str):
+    # Imported and built once per key so transcriptions reuse the client's connection pool.
     try:
         from openai import OpenAI
     except Exception as exc:  # pragma: no cover - optional runtime dependency
         raise RuntimeError("OpenAI client library is not installed") from exc
+    return OpenAI(api_key=api_key)
+
 
+def _transcribe_audio_openai(*, audio_bytes: bytes, filename: str, content_type: str | None) -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not configured")
+    client = _get_openai_client(api_key)
 
     model = os.getenv("SPEECH_TRANSCRIBE_MODEL", "whisper-1")
 
@@ -535,7 +563,6 @@ def _transcribe_audio_openai(*, audio_bytes: bytes, filename: str, content_type:
     with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
         tmp.write(audio_bytes)
         tmp.flush()
-        client = OpenAI(api_key=api_key)
         with open(tmp.name, "rb") as handle:
             result = client.audio.transcriptions.create(model=model, file=handle)
     text = getattr(result, "text", None)
@@ -728,6 +755,15 @@ def list_requests(_auth: None = Depends(_require_admin_token)):
     return list_pending_requests()
 
 
+@app.get("/admin/decisions")
+def get_decisions(ids: str = Query(...), _auth: None = Depends(_require_admin_token)):
+    """Batch decision lookup for comma-separated ids; pending ids are left out."""
+    request_ids = [request_id for request_id in ids.split(",") if request_id]
+    if len(request_ids) > MAX_DECISION_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DECISION_BATCH} ids per request")
+    return {"decisions": get_admin_decisions(request_ids)}
+
+
 @app.get("/admin/decisions/{request_id}")
 def get_decision(request_id: str, _auth: None = Depends(_require_admin_token)):
     request_item = get_admin_request(request_id)
@@ -740,6 +776,22 @@ def get_decision(request_id: str, _auth: None = Depends(_require_admin_token)):
     return decision
 
 
+@app.get("/admin/decisions/{request_id}/wait")
+async def wait_for_decision(
+    request_id: str,
+    timeout: float = Query(default=20.0, ge=0, le=MAX_DECISION_WAIT_SECONDS),
+    _auth: None = Depends(_require_admin_token),
+):
+    """Long-poll variant of get_decision: responds as soon as a decision is posted."""
+    if not await asyncio.to_thread(get_admin_request, request_id):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    decision = await wait_for_admin_decision(request_id, timeout)
+    if not decision:
+        raise HTTPException(status_code=404, detail="Decision pending")
+    return decision
+
+
 @app.post("/admin/decision")
 def post_decision(decision: DecisionIn, _auth: None = Depends(_require_admin_token)):
     decision_result = post_admin_decision(
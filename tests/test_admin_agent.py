@@ -1,7 +1,24 @@
-from chatbot_parking.admin_agent import request_admin_approval
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+import requests
+
+from chatbot_parking import admin_agent, admin_api
+from chatbot_parking.admin_agent import get_admin_config, request_admin_approval, request_admin_approval_tool
+from chatbot_parking.admin_store import list_pending_requests, post_admin_decision
 from chatbot_parking.chatbot import ReservationRequest
 
 
+@pytest.fixture(autouse=True)
+def _reset_admin_config():
+    get_admin_config.cache_clear()
+    yield
+    get_admin_config.cache_clear()
+
+
 def test_request_admin_approval_uses_http_when_admin_api_url_set(monkeypatch):
     monkeypatch.setenv("ADMIN_API_URL", "http://admin-ui.local")
     monkeypatch.setenv("ADMIN_AUTO_APPROVE", "true")
@@ -33,3 +50,198 @@ def test_request_admin_approval_uses_http_when_admin_api_url_set(monkeypatch):
 
     assert decision.approved is True
     assert calls[0][0] == "http://admin-ui.local/admin/request"
+
+
+def _reservation() -> ReservationRequest:
+    return ReservationRequest(
+        name="Alex",
+        surname="Morgan",
+        car_number="XY-1234",
+        reservation_period="2026-02-20 09:00 to 2026-02-20 18:00",
+    )
+
+
+def _decide_next_pending(notes: str, approved: bool = True) -> threading.Thread:
+    """Start a thread that decides the first approval request submitted after this call."""
+    existing = {item["request_id"] for item in list_pending_requests()}
+
+    def decide_when_submitted():
+        for _ in range(250):
+            new_ids = [item["request_id"] for item in list_pending_requests() if item["request_id"] not in existing]
+            if new_ids:
+                post_admin_decision(new_ids[0], approved=approved, notes=notes)
+                return
+            time.sleep(0.02)
+
+    approver = threading.Thread(target=decide_when_submitted)
+    approver.start()
+    return approver
+
+
+def test_request_admin_approval_async_picks_up_store_decision(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_URL", raising=False)
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "false")
+    monkeypatch.setenv("ADMIN_POLL_INTERVAL", "0.2")
+    monkeypatch.setenv("ADMIN_POLL_TIMEOUT", "5")
+
+    approver = _decide_next_pending("looks good")
+    decision = asyncio.run(admin_agent.request_admin_approval_async(_reservation()))
+    approver.join()
+
+    assert decision.approved is True
+    assert decision.notes == "looks good"
+
+
+def test_request_admin_approval_wakes_on_in_process_decision(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_URL", raising=False)
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "false")
+    # A long poll interval: only the wakeup can make this finish quickly.
+    monkeypatch.setenv("ADMIN_POLL_INTERVAL", "30")
+    monkeypatch.setenv("ADMIN_POLL_TIMEOUT", "30")
+    monkeypatch.setattr(admin_agent, "INITIAL_POLL_DELAY", 30.0)
+
+    started = time.monotonic()
+    approver = _decide_next_pending("full", approved=False)
+    decision = admin_agent.request_admin_approval(_reservation())
+    approver.join()
+
+    assert decision.approved is False
+    assert decision.notes == "full"
+    assert time.monotonic() - started < 5
+
+
+def test_http_polling_backs_off_while_admin_api_fails(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_URL", "http://admin-ui.local")
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "false")
+    monkeypatch.setenv("ADMIN_POLL_INTERVAL", "0.01")
+    monkeypatch.setenv("ADMIN_POLL_TIMEOUT", "0.5")
+    monkeypatch.setattr(admin_agent, "_post_json", lambda url, payload: {"request_id": "req-1"})
+
+    calls = []
+
+    def failing_get_json(url, timeout=5):
+        calls.append(url)
+        raise requests.ConnectionError("admin API down")
+
+    monkeypatch.setattr(admin_agent, "_get_json", failing_get_json)
+
+    decision = admin_agent.request_admin_approval(_reservation())
+
+    assert decision.approved is False
+    # Doubling pauses (10, 20, 40 ms, ...) keep the attempts far below timeout / interval.
+    assert len(calls) <= 8
+
+
+def test_long_poll_wait_is_capped_by_the_approval_deadline(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_URL", "http://admin-ui.local")
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "false")
+    monkeypatch.setenv("ADMIN_LONG_POLL_SECONDS", "20")
+    monkeypatch.setenv("ADMIN_POLL_TIMEOUT", "0.5")
+    monkeypatch.setattr(admin_agent, "_post_json", lambda url, payload: {"request_id": "req-1"})
+
+    timeouts = []
+
+    def fake_get_json(url, timeout=5):
+        timeouts.append((url, timeout))
+        return {"approved": True, "decided_at": "2026-01-01T00:00:00Z"}
+
+    monkeypatch.setattr(admin_agent, "_get_json", fake_get_json)
+
+    assert admin_agent.request_admin_approval(_reservation()).approved is True
+    url, timeout = timeouts[0]
+    wait = float(url.rsplit("timeout=", 1)[1])
+    assert 0 < wait <= 0.5
+    assert timeout <= 5.5
+
+
+def test_admin_api_wait_rejects_unknown_request_immediately(monkeypatch):
+    monkeypatch.delenv("ADMIN_UI_TOKEN", raising=False)
+    monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+
+    started = time.monotonic()
+    response = TestClient(admin_api.app).get("/admin/decisions/unknown-id/wait", params={"timeout": 30})
+
+    assert response.status_code == 404
+    assert time.monotonic() - started < 5
+
+
+def test_request_admin_approval_async_wakes_on_in_process_decision(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_URL", raising=False)
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "false")
+    monkeypatch.setenv("ADMIN_POLL_INTERVAL", "30")
+    monkeypatch.setenv("ADMIN_POLL_TIMEOUT", "30")
+    monkeypatch.setattr(admin_agent, "INITIAL_POLL_DELAY", 30.0)
+
+    started = time.monotonic()
+    approver = _decide_next_pending("async ok")
+    decision = asyncio.run(admin_agent.request_admin_approval_async(_reservation()))
+    approver.join()
+
+    assert decision.approved is True
+    assert decision.notes == "async ok"
+    assert time.monotonic() - started < 5
+
+
+def test_batched_http_polls_share_one_request(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_URL", "http://admin-ui.local")
+    monkeypatch.setenv("ADMIN_BATCH_POLLS", "true")
+    monkeypatch.setattr(admin_agent, "DECISION_BATCH_WINDOW", 0.2)
+    admin_agent._get_batcher.cache_clear()
+
+    calls = []
+
+    def fake_get_json(url):
+        calls.append(url)
+        return {"decisions": {"req-1": {"approved": True, "decided_at": "2026-01-01T00:00:00Z"}}}
+
+    monkeypatch.setattr(admin_agent, "_get_json", fake_get_json)
+
+    results = {}
+
+    def poll(request_id):
+        results[request_id] = admin_agent._decision_fetcher(request_id, "http://admin-ui.local")(10.0)
+
+    threads = [threading.Thread(target=poll, args=(request_id,)) for request_id in ("req-1", "req-2")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert calls[0].startswith("http://admin-ui.local/admin/decisions?ids=")
+    assert results["req-1"]["approved"] is True
+    assert results["req-2"] is None
+
+
+def test_admin_approval_tool_supports_ainvoke(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_URL", raising=False)
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "true")
+
+    result = asyncio.run(
+        request_admin_approval_tool.ainvoke(
+            {
+                "name": "Alex",
+                "surname": "Morgan",
+                "car_number": "XY-1234",
+                "reservation_period": "2026-02-20 09:00 to 2026-02-20 18:00",
+            }
+        )
+    )
+
+    assert result["approved"] is True
+    assert result["notes"] == "Auto-approved via configured demo mode"
+
+
+def test_in_process_auto_approve_skips_the_store(monkeypatch):
+    monkeypatch.delenv("ADMIN_API_URL", raising=False)
+    monkeypatch.setenv("ADMIN_AUTO_APPROVE", "true")
+
+    def unexpected_create(payload):
+        raise AssertionError("auto-approve should not create a store record")
+
+    monkeypatch.setattr(admin_agent, "create_admin_request", unexpected_create)
+
+    decision = admin_agent.request_admin_approval(_reservation())
+
+    assert decision.approved is True
+    assert decision.notes == admin_agent.AUTO_APPROVE_NOTES
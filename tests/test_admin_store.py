@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+from chatbot_parking import admin_store
+from chatbot_parking.persistence import InMemoryPersistence
+
+
+def test_pending_list_cache_is_invalidated_by_store_mutations(monkeypatch):
+    persistence = InMemoryPersistence()
+    monkeypatch.setattr(admin_store, "get_persistence", lambda: persistence)
+    monkeypatch.setenv("ADMIN_PENDING_CACHE_TTL", "60")
+
+    first = admin_store.create_admin_request({"name": "A"})
+    assert [item["request_id"] for item in admin_store.list_pending_requests()] == [first]
+
+    # Out-of-band writes are served from the cache until the TTL expires...
+    persistence.create_approval({"name": "B"})
+    assert [item["request_id"] for item in admin_store.list_pending_requests()] == [first]
+
+    # ...while writes through admin_store are visible immediately.
+    admin_store.post_admin_decision(first, approved=True)
+    assert [item["payload"]["name"] for item in admin_store.list_pending_requests()] == ["B"]
+
+
+def test_every_waiter_on_a_request_is_woken(monkeypatch):
+    persistence = InMemoryPersistence()
+    monkeypatch.setattr(admin_store, "get_persistence", lambda: persistence)
+    request_id = admin_store.create_admin_request({"name": "A"})
+
+    with admin_store.decision_waiter(request_id) as first:
+        with admin_store.decision_waiter(request_id) as second:
+            admin_store.post_admin_decision(request_id, approved=True)
+            assert first.is_set() and second.is_set()
+        # Leaving the inner waiter keeps the outer one registered.
+        assert len(admin_store._DECISION_WAITERS[request_id]) == 1
+    assert request_id not in admin_store._DECISION_WAITERS
+
+
+def test_sync_and_async_waiters_on_one_request_both_wake(monkeypatch):
+    persistence = InMemoryPersistence()
+    monkeypatch.setattr(admin_store, "get_persistence", lambda: persistence)
+    # Only the in-process wakeup can make the async wait return quickly.
+    monkeypatch.setattr(admin_store, "STORE_RECHECK_SECONDS", 30.0)
+    request_id = admin_store.create_admin_request({"name": "A"})
+
+    async def wait_both() -> tuple[dict | None, bool]:
+        with admin_store.decision_waiter(request_id) as sync_decided:
+            async_wait = asyncio.create_task(admin_store.wait_for_admin_decision(request_id, 30))
+            await asyncio.sleep(0.05)  # let the async waiter register
+            threading.Timer(0.05, admin_store.post_admin_decision, args=(request_id, True, "ok")).start()
+            decision = await async_wait
+            return decision, sync_decided.wait(5)
+
+    started = time.monotonic()
+    decision, sync_woken = asyncio.run(wait_both())
+
+    assert decision is not None and decision["notes"] == "ok"
+    assert sync_woken is True
+    assert time.monotonic() - started < 5
@@ -7,3 +7,8 @@ def test_reservation_intent_true() -> None:
 
 def test_reservation_intent_false() -> None:
     assert is_reservation_intent("What are your prices?") is False
+
+
+def test_reservation_intent_from_structured_details() -> None:
+    assert is_reservation_intent("Surname=Doe") is True
+    assert is_reservation_intent("Can I park at 09:00 tomorrow?") is False
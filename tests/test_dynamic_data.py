@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+
+import chatbot_parking.dynamic_data as dynamic_data
+
+
+def test_dynamic_info_is_cached_within_ttl(monkeypatch, tmp_path):
+    db_path = tmp_path / "parking.db"
+    monkeypatch.setenv("PARKING_DB_PATH", str(db_path))
+    monkeypatch.setattr(dynamic_data, "DYNAMIC_INFO_TTL_SECONDS", 60.0)
+    dynamic_data.clear_dynamic_info_cache()
+
+    first = dynamic_data.get_dynamic_info()
+    assert first.available_spaces == dynamic_data.DEFAULT_AVAILABLE_SPACES
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE parking_status SET available_spaces = 7")
+
+    assert dynamic_data.get_dynamic_info() is first
+
+    dynamic_data.clear_dynamic_info_cache()
+    assert dynamic_data.get_dynamic_info().available_spaces == 7
+
+
+def test_failed_read_reseeds_database(monkeypatch, tmp_path):
+    db_path = tmp_path / "parking.db"
+    monkeypatch.setenv("PARKING_DB_PATH", str(db_path))
+    dynamic_data.clear_dynamic_info_cache()
+    dynamic_data.get_dynamic_info()
+    assert db_path in dynamic_data._INITIALIZED
+
+    original_connect = dynamic_data._connect
+
+    def failing_connect(path):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    # Opening fails before a connection is cached: the sqlite3 error must surface, not a KeyError.
+    monkeypatch.setattr(dynamic_data, "_connect", failing_connect)
+    dynamic_data._LOCAL.connections.pop(db_path).close()
+    with pytest.raises(sqlite3.OperationalError):
+        dynamic_data._read_status(db_path)
+    assert db_path not in dynamic_data._INITIALIZED
+
+    monkeypatch.setattr(dynamic_data, "_connect", original_connect)
+    db_path.unlink()
+    dynamic_data.clear_dynamic_info_cache()
+    assert dynamic_data.get_dynamic_info().available_spaces == dynamic_data.DEFAULT_AVAILABLE_SPACES
+    assert db_path.exists()
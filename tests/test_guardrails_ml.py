@@ -1,3 +1,8 @@
+import logging
+import os
+import sys
+import types
+
 from chatbot_parking import guardrails
 
 
@@ -19,3 +24,102 @@ def test_redact_sensitive_returns_redacted_when_ml_detects_sensitive(monkeypatch
     monkeypatch.setattr(guardrails, "_load_ner_pipeline", lambda: fake_ner)
 
     assert guardrails.redact_sensitive("Alice reservation details") == "[REDACTED]"
+
+
+def test_filter_sensitive_batches_ner_calls(monkeypatch) -> None:
+    calls: list[list[str]] = []
+
+    def fake_ner(texts, batch_size=1):
+        assert batch_size == guardrails.NER_BATCH_SIZE
+        calls.append(list(texts))
+        return [[{"entity_group": "PER"}] if "Alice" in text else [] for text in texts]
+
+    guardrails._load_ner_pipeline.cache_clear()
+    monkeypatch.setattr(guardrails, "_load_ner_pipeline", lambda: fake_ner)
+
+    chunks = [
+        "Hours are 06:00-23:00",
+        "Alice booked spot 4",
+        "Contact admin@example.com",
+        "Pricing is $2/hour",
+        "open 24/7, no fee",
+    ]
+    assert guardrails.filter_sensitive(chunks) == ["Hours are 06:00-23:00", "Pricing is $2/hour", "open 24/7, no fee"]
+    # Lower-case text without "@" or digit runs cannot hold a PER/EMAIL/PHONE entity.
+    assert calls == [["Hours are 06:00-23:00", "Alice booked spot 4", "Pricing is $2/hour"]]
+
+
+def test_redact_sensitive_skips_ner_when_only_placeholders_remain(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_ner(text: str):
+        calls.append(text)
+        return []
+
+    guardrails._load_ner_pipeline.cache_clear()
+    monkeypatch.setattr(guardrails, "_load_ner_pipeline", lambda: fake_ner)
+
+    assert guardrails.redact_sensitive("mail admin@example.com now") == "mail [REDACTED] now"
+    assert calls == []
+
+
+def _fake_transformers(monkeypatch) -> None:
+    fake = types.ModuleType("transformers")
+    fake.pipeline = lambda task, model, **kwargs: ("pipeline", model)
+    fake.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda name: ("tokenizer", name))
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+
+
+def test_quantized_ner_failure_is_logged_and_falls_back(monkeypatch, caplog) -> None:
+    _fake_transformers(monkeypatch)
+    monkeypatch.setenv("GUARDRAILS_USE_ML", "true")
+    monkeypatch.setenv("GUARDRAILS_QUANTIZE", "true")
+    monkeypatch.setenv("GUARDRAILS_NER_MODEL", "some/model")
+
+    def missing_optimum(model_name: str):
+        raise ImportError("No module named 'optimum'")
+
+    monkeypatch.setattr(guardrails, "_load_quantized_ner_pipeline", missing_optimum)
+    guardrails._load_ner_pipeline.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger=guardrails.__name__):
+            assert guardrails._load_ner_pipeline() == ("pipeline", "some/model")
+    finally:
+        guardrails._load_ner_pipeline.cache_clear()
+    assert "GUARDRAILS_QUANTIZE" in caplog.text
+
+
+def test_quantized_ner_export_is_moved_into_place(monkeypatch, tmp_path) -> None:
+    _fake_transformers(monkeypatch)
+    monkeypatch.setenv("GUARDRAILS_QUANTIZED_DIR", str(tmp_path))
+    exports: list[str] = []
+
+    class FakeQuantizer:
+        @classmethod
+        def from_pretrained(cls, model):
+            return cls()
+
+        def quantize(self, save_dir: str, quantization_config) -> None:
+            exports.append(save_dir)
+            with open(os.path.join(save_dir, "model_quantized.onnx"), "w") as handle:
+                handle.write("onnx")
+
+    onnxruntime = types.ModuleType("optimum.onnxruntime")
+    onnxruntime.ORTQuantizer = FakeQuantizer
+    onnxruntime.ORTModelForTokenClassification = types.SimpleNamespace(
+        from_pretrained=lambda name, **kwargs: ("model", name)
+    )
+    configuration = types.ModuleType("optimum.onnxruntime.configuration")
+    configuration.AutoQuantizationConfig = types.SimpleNamespace(avx512_vnni=lambda **kwargs: None)
+    monkeypatch.setitem(sys.modules, "optimum", types.ModuleType("optimum"))
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", onnxruntime)
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime.configuration", configuration)
+
+    save_dir = tmp_path / "some--model"
+    assert guardrails._load_quantized_ner_pipeline("some/model")[0] == "pipeline"
+    # A second load reuses the export instead of quantizing again.
+    guardrails._load_quantized_ner_pipeline("some/model")
+
+    assert len(exports) == 1 and exports[0] != str(save_dir)
+    assert (save_dir / "model_quantized.onnx").read_text() == "onnx"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["some--model"]
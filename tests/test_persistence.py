@@ -1,4 +1,14 @@
-from chatbot_parking.persistence import InMemoryPersistence
+import threading
+
+import pytest
+from azure.cosmos import exceptions
+
+from chatbot_parking.persistence import (
+    CosmosPersistence,
+    DeferredWrites,
+    InMemoryPersistence,
+    ThreadUpdateConflict,
+)
 
 
 def test_in_memory_persistence_thread_approval_and_reservation_round_trip():
@@ -23,6 +33,7 @@ def test_in_memory_persistence_thread_approval_and_reservation_round_trip():
     decision = persistence.set_approval_decision(request_id, approved=True, notes="ok")
     assert decision is not None
     assert decision["approved"] is True
+    assert persistence.list_pending_approvals() == []
 
     saved = persistence.append_reservation(
         name="Alex Morgan",
@@ -34,3 +45,143 @@ def test_in_memory_persistence_thread_approval_and_reservation_round_trip():
 
     assert saved["request_id"] == request_id
     assert persistence.reservations
+
+
+def test_in_memory_pending_approvals_keep_creation_order_and_survive_clear():
+    persistence = InMemoryPersistence()
+    first = persistence.create_approval({"name": "A"})
+    second = persistence.create_approval({"name": "B"})
+    third = persistence.create_approval({"name": "C"})
+    persistence.set_approval_decision(second, approved=False)
+
+    assert [item["request_id"] for item in persistence.list_pending_approvals()] == [first, third]
+    assert [item["request_id"] for item in persistence.list_decided_approvals(approved=False)] == [second]
+    assert persistence.list_decided_approvals(approved=True) == []
+
+    persistence.approvals.clear()
+    assert persistence.list_pending_approvals() == []
+
+
+def test_in_memory_decided_approvals_keep_creation_order():
+    persistence = InMemoryPersistence()
+    first = persistence.create_approval({"name": "A"})
+    second = persistence.create_approval({"name": "B"})
+    persistence.set_approval_decision(second, approved=True)
+    persistence.set_approval_decision(first, approved=True)
+    persistence.approvals["direct"] = {
+        "request_id": "direct",
+        "payload": {},
+        "decision": {"approved": True, "decided_at": "2026-01-01T00:00:00Z"},
+        "created_at": "2026-01-01T00:00:00Z",
+    }
+
+    assert [item["request_id"] for item in persistence.list_decided_approvals()] == [first, second, "direct"]
+
+
+def test_in_memory_approvals_evict_oldest_decided_first(monkeypatch):
+    monkeypatch.setattr("chatbot_parking.persistence.APPROVALS_MAXSIZE", 3)
+    persistence = InMemoryPersistence()
+    pending = persistence.create_approval({"name": "A"})
+    decided_first = persistence.create_approval({"name": "B"})
+    decided_last = persistence.create_approval({"name": "C"})
+    persistence.set_approval_decision(decided_first, approved=True)
+    persistence.set_approval_decision(decided_last, approved=False)
+
+    newest = persistence.create_approval({"name": "D"})
+
+    assert set(persistence.approvals) == {pending, decided_last, newest}
+    assert [item["request_id"] for item in persistence.list_pending_approvals()] == [pending, newest]
+
+
+def test_update_thread_passes_prior_state_and_stores_result():
+    persistence = InMemoryPersistence()
+    persistence.upsert_thread("t-1", {"turns": 1})
+
+    result = persistence.update_thread("t-1", lambda state: ("ok", {"turns": state["turns"] + 1}))
+
+    assert result == "ok"
+    assert persistence.get_thread("t-1") == {"turns": 2}
+    assert persistence.update_thread("t-2", lambda state: (state, {"turns": 1})) is None
+
+
+class _RacingThreads:
+    """Threads container whose conditional writes lose to another writer `conflicts` times."""
+
+    def __init__(self, conflicts: int) -> None:
+        self.conflicts = conflicts
+        self.item = {"id": "t-1", "state": {"turns": 1}, "_etag": "v1"}
+
+    def read_item(self, item: str, partition_key: str) -> dict:
+        return dict(self.item)
+
+    def replace_item(self, item: str, body: dict, etag: str, match_condition) -> None:
+        if self.conflicts:
+            self.conflicts -= 1
+            self.item = {**self.item, "state": {"turns": self.item["state"]["turns"] + 10}, "_etag": etag + "x"}
+            raise exceptions.CosmosAccessConditionFailedError(status_code=412, message="etag mismatch")
+        self.item = {**body, "_etag": etag + "y"}
+
+
+def _cosmos_with(threads: _RacingThreads) -> CosmosPersistence:
+    persistence = CosmosPersistence.__new__(CosmosPersistence)
+    persistence._threads = threads
+    persistence._thread_cache_ttl = 0
+    persistence._thread_cache = {}
+    persistence._thread_cache_lock = threading.Lock()
+    return persistence
+
+
+def test_cosmos_update_thread_retries_on_conflict_with_fresh_state():
+    threads = _RacingThreads(conflicts=1)
+    seen: list[int] = []
+
+    def turn(state):
+        seen.append(state["turns"])
+        return "ok", {"turns": state["turns"] + 1}
+
+    assert _cosmos_with(threads).update_thread("t-1", turn) == "ok"
+    assert seen == [1, 11]
+    assert threads.item["state"] == {"turns": 12}
+
+
+def test_cosmos_update_thread_raises_after_bounded_conflicts(monkeypatch):
+    monkeypatch.setattr("chatbot_parking.persistence.THREAD_UPDATE_ATTEMPTS", 2)
+    threads = _RacingThreads(conflicts=5)
+
+    with pytest.raises(ThreadUpdateConflict):
+        _cosmos_with(threads).update_thread("t-1", lambda state: (None, state))
+    assert threads.conflicts == 3
+
+
+def test_deferred_writes_flush_only_the_stored_attempt():
+    threads = _RacingThreads(conflicts=1)
+    store = InMemoryPersistence()
+    attempts: list[DeferredWrites] = []
+
+    def turn(state):
+        attempts.append(DeferredWrites(store))
+        request_id = attempts[-1].create_approval({"name": "A"})
+        return request_id, {**state, "request_id": request_id}
+
+    request_id = _cosmos_with(threads).update_thread("t-1", turn)
+    assert store.approvals == {}
+    attempts[-1].flush()
+
+    assert len(attempts) == 2
+    assert list(store.approvals) == [request_id]
+    assert threads.item["state"]["request_id"] == request_id
+
+
+def test_cosmos_update_thread_raises_when_reads_keep_failing(monkeypatch):
+    monkeypatch.setattr("chatbot_parking.persistence.THREAD_UPDATE_ATTEMPTS", 2)
+    threads = _RacingThreads(conflicts=0)
+
+    def unavailable(item: str, partition_key: str) -> dict:
+        raise exceptions.CosmosHttpResponseError(status_code=503, message="unavailable")
+
+    threads.read_item = unavailable
+    turns = []
+
+    with pytest.raises(exceptions.CosmosHttpResponseError):
+        _cosmos_with(threads).update_thread("t-1", lambda state: turns.append(state) or (None, {}))
+    assert turns == []
@@ -0,0 +1,74 @@
+import chatbot_parking.chatbot as chatbot_module
+from chatbot_parking.chatbot import ParkingChatbot
+from chatbot_parking.rag import CachedQueryEmbeddings
+from chatbot_parking.semantic_cache import SemanticCache
+
+from langchain_core.documents import Document
+
+
+def test_semantic_cache_matches_near_duplicates_and_evicts_lru(monkeypatch):
+    cache = SemanticCache(2, threshold=0.9, ttl=60)
+    cache.put([1.0, 0.0], "hours")
+    cache.put([0.0, 1.0], "pricing")
+
+    assert cache.get([0.99, 0.05]) == "hours"
+    assert cache.get([0.7, 0.7]) is None
+
+    # "pricing" is now least recently used and gets evicted.
+    cache.put([-1.0, 0.0], "rules")
+    assert len(cache) == 2
+    assert cache.get([0.0, 1.0]) is None
+    assert cache.get([-1.0, 0.0]) == "rules"
+
+    monkeypatch.setattr("chatbot_parking.semantic_cache.time.monotonic", lambda: 1e12)
+    assert cache.get([1.0, 0.0]) is None
+    assert len(cache) == 1
+
+
+def test_answer_question_reuses_cached_answer(monkeypatch):
+    monkeypatch.setenv("RAG_SEMANTIC_CACHE_SIZE", "8")
+    bot = ParkingChatbot()
+
+    class Embedder:
+        def embed_query(self, text: str) -> list[float]:
+            return [1.0, float(len(text) % 3)]
+
+    class DummyStore:
+        embeddings = Embedder()
+
+        def similarity_search_by_vector(self, _embedding, k: int = 3):
+            return [Document(page_content="Hours are 06:00-23:00", metadata={"sensitivity": "public"})]
+
+    bot.vector_store = DummyStore()
+    calls: list[str] = []
+
+    def fake_generate_answer(question: str, context: str, dynamic_info: str) -> str:
+        calls.append(question)
+        return "ok"
+
+    monkeypatch.setattr(chatbot_module, "generate_answer", fake_generate_answer)
+
+    assert bot.answer_question("What are the hours?") == "ok"
+    assert bot.answer_question("What are the hours?") == "ok"
+    assert calls == ["What are the hours?"]
+
+
+def test_cached_query_embeddings_embeds_each_text_once():
+    calls: list[str] = []
+
+    class Embedder:
+        def embed_query(self, text: str) -> list[float]:
+            calls.append(text)
+            return [float(len(text)), 1.0]
+
+        def embed_documents(self, texts: list[str]) -> list[list[float]]:
+            return [self.embed_query(text) for text in texts]
+
+    embedder = CachedQueryEmbeddings(Embedder())
+    assert embedder.embed_query("hours") == embedder.embed_query("hours") == [5.0, 1.0]
+    embedder.embed_query("price")
+    assert calls == ["hours", "price"]
+
+    embedder.cache_clear()
+    embedder.embed_query("hours")
+    assert calls == ["hours", "price", "hours"]
@@ -0,0 +1,34 @@
+import chatbot_parking.config as config
+from chatbot_parking.rag import build_vector_store, retrieve
+
+
+def test_int8_quantized_faiss_store_returns_documents(monkeypatch):
+    monkeypatch.setenv("VECTOR_BACKEND", "faiss")
+    monkeypatch.setenv("VECTOR_QUANTIZATION", "int8")
+    config.get_settings.cache_clear()
+    try:
+        store = build_vector_store(insert_documents=False)
+        assert type(store.index).__name__ == "IndexScalarQuantizer"
+        result = retrieve("working hours", store, k=3)
+        assert result.documents
+        assert all(doc.metadata.get("source_id") for doc in result.documents)
+    finally:
+        monkeypatch.delenv("VECTOR_QUANTIZATION")
+        config.get_settings.cache_clear()
+
+
+def test_hnsw_faiss_store_returns_documents(monkeypatch):
+    monkeypatch.setenv("VECTOR_BACKEND", "faiss")
+    monkeypatch.setenv("VECTOR_INDEX", "hnsw")
+    monkeypatch.setenv("HNSW_EF_SEARCH", "16")
+    config.get_settings.cache_clear()
+    try:
+        store = build_vector_store(insert_documents=False)
+        assert type(store.index).__name__ == "IndexHNSWFlat"
+        assert store.index.hnsw.efSearch == 16
+        result = retrieve("working hours", store, k=3)
+        assert result.documents
+    finally:
+        monkeypatch.delenv("VECTOR_INDEX")
+        monkeypatch.delenv("HNSW_EF_SEARCH")
+        config.get_settings.cache_clear()
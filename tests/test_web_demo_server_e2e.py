@@ -36,6 +36,10 @@ def test_e2e_booking_admin_approve_records_reservation(monkeypatch):
     assert listed.status_code == 200
     assert any(item["request_id"] == request_id for item in listed.json())
 
+    batch = client.get("/admin/decisions", params={"ids": f"{request_id},unknown"}, headers={"x-api-token": "secret"})
+    assert batch.status_code == 200
+    assert batch.json() == {"decisions": {}}
+
     decided = client.post(
         "/admin/decision",
         json={"request_id": request_id, "approved": True, "notes": "ok"},
@@ -43,8 +47,37 @@ def test_e2e_booking_admin_approve_records_reservation(monkeypatch):
     )
     assert decided.status_code == 200
     assert decided.json()["approved"] is True
+    batch = client.get("/admin/decisions", params={"ids": request_id}, headers={"x-api-token": "secret"})
+    assert batch.json()["decisions"][request_id]["approved"] is True
 
     confirmed = client.post("/chat/message", json={"thread_id": thread_id, "message": "status?"})
     assert confirmed.status_code == 200
     assert confirmed.json()["status"] == "approved"
     assert persistence.reservations
+
+
+def test_decision_wait_endpoint_returns_when_decision_is_posted(monkeypatch):
+    import threading
+    import time
+
+    persistence = InMemoryPersistence()
+    monkeypatch.setattr(web_demo_server, "get_persistence", lambda: persistence)
+    monkeypatch.setattr(admin_store, "get_persistence", lambda: persistence)
+    monkeypatch.setenv("ADMIN_UI_TOKEN", "secret")
+
+    client = TestClient(web_demo_server.app)
+    headers = {"x-api-token": "secret"}
+    request_id = admin_store.create_admin_request({"name": "Roman"})
+
+    pending = client.get(f"/admin/decisions/{request_id}/wait", params={"timeout": 0}, headers=headers)
+    assert pending.status_code == 404
+
+    decider = threading.Timer(0.2, admin_store.post_admin_decision, args=(request_id, False, "full"))
+    started = time.monotonic()
+    decider.start()
+    decided = client.get(f"/admin/decisions/{request_id}/wait", params={"timeout": 30}, headers=headers)
+    decider.join()
+
+    assert decided.status_code == 200
+    assert decided.json()["notes"] == "full"
+    assert time.monotonic() - started < 5